@@ -13,6 +13,18 @@ try:
 except Exception as e:
     Tool = None  # we'll handle absence below
 
+# Optional fast JSON encoder (falls back to the stdlib json module)
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+def _dumps(obj) -> str:
+    """Serialize a tool result to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=str)
+
 # Import agent node wrappers
 try:
     import part1_reflex_agent as reflex_mod
@@ -30,7 +42,7 @@ def _reflex_tool_impl(day: str):
         return json.dumps({"error": "reflex module not available"})
     try:
         rpt = reflex_mod.reflex_day_lookup_tool(day)
-        return json.dumps(rpt, default=str)
+        return _dumps(rpt)
     except Exception as e:
         return json.dumps({"error": str(e)})
 
@@ -40,7 +52,7 @@ def _goal_tool_impl(pantry):
         return json.dumps({"error": "goal module not available"})
     try:
         result = goal_mod.goal_compute_tool(pantry)
-        return json.dumps(result, default=str)
+        return _dumps(result)
     except Exception as e:
         return json.dumps({"error": str(e)})
 
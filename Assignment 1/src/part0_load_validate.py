@@ -1,6 +1,12 @@
 import pandas as pd
 from pathlib import Path
 
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except Exception:
+    _EXCEL_ENGINE = None
+
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "meals.xlsx"
 
 def normalize_ingredient(name: str) -> str:
@@ -11,18 +17,37 @@ def extract_ingredients(cell) -> list:
         return []
     return [normalize_ingredient(p) for p in str(cell).split(";") if p.strip()]
 
+# Read sheets with the Rust calamine engine when installed (pandas >= 2.2); otherwise
+# fall back to one read-only openpyxl workbook (rows are streamed, workbook opened once)
+def _read_sheets(path: Path, *sheet_names):
+    if _EXCEL_ENGINE == "calamine":
+        with pd.ExcelFile(path, engine="calamine") as xl:
+            return [xl.parse(name) for name in sheet_names]
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        frames = []
+        for name in sheet_names:
+            rows = wb[name].iter_rows(values_only=True)
+            header = next(rows, ())
+            data = [r for r in rows if any(v is not None for v in r)]
+            frames.append(pd.DataFrame(data, columns=list(header)))
+        return frames
+    finally:
+        wb.close()
+
 def load_data(path: Path):
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {path}")
-    meals = pd.read_excel(path, sheet_name="Meals")
-    costs = pd.read_excel(path, sheet_name="IngredientCosts")
+    meals, costs = _read_sheets(path, "Meals", "IngredientCosts")
     return meals, costs
 
 def validate_ingredients(meals_df: pd.DataFrame, costs_df: pd.DataFrame):
-    meal_ings = set()
-    for _, r in meals_df.iterrows():
-        meal_ings.update(extract_ingredients(r.get("Ingredients", "")))
-    cost_ings = {normalize_ingredient(i) for i in costs_df["Ingredient"].astype(str).tolist()}
+    # Vectorized: split/normalize the whole Ingredients column at once (same rules as extract_ingredients)
+    cells = meals_df["Ingredients"] if "Ingredients" in meals_df else pd.Series("", index=meals_df.index)
+    parts = cells.fillna("").astype(str).str.lower().str.split(";").explode().str.strip()
+    meal_ings = set(parts[parts != ""].dropna())
+    cost_ings = set(costs_df["Ingredient"].astype(str).str.strip().str.lower())
     missing = sorted(meal_ings - cost_ings)
     if missing:
         raise AssertionError(f"Missing ingredients in IngredientCosts: {missing}")
@@ -1,40 +1,86 @@
+import functools
+import sys
 import pandas as pd
 from pathlib import Path
 import os
-import matplotlib.pyplot as plt
 from datetime import datetime
 
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except Exception:
+    _EXCEL_ENGINE = None
+
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "meals.xlsx"
 
+# Read sheets with the Rust calamine engine when installed (pandas >= 2.2); otherwise
+# fall back to one read-only openpyxl workbook (rows are streamed, workbook opened once)
+def _read_sheets(path: Path, *sheet_names):
+    if _EXCEL_ENGINE == "calamine":
+        with pd.ExcelFile(path, engine="calamine") as xl:
+            return [xl.parse(name) for name in sheet_names]
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        frames = []
+        for name in sheet_names:
+            rows = wb[name].iter_rows(values_only=True)
+            header = next(rows, ())
+            data = [r for r in rows if any(v is not None for v in r)]
+            frames.append(pd.DataFrame(data, columns=list(header)))
+        return frames
+    finally:
+        wb.close()
+
+# Parquet sidecar for one sheet, stored next to the workbook (e.g. data/meals.Meals.parquet)
+def _sidecar_path(path: Path, sheet: str) -> Path:
+    return path.with_name(f"{path.stem}.{sheet}.parquet")
+
 # Node: load data
 def load_data_node(path: Path = DATA_PATH):
     """Node: load Meals and IngredientCosts sheets and return (meals_df, costs_df)."""
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {path}")
-    meals = pd.read_excel(path, sheet_name="Meals")
-    costs = pd.read_excel(path, sheet_name="IngredientCosts")
+    sheets = ("Meals", "IngredientCosts")
+    sidecars = [_sidecar_path(path, s) for s in sheets]
+    # Reuse the parquet copies while they are newer than the workbook
+    xlsx_mtime = path.stat().st_mtime
+    try:
+        if all(p.exists() and p.stat().st_mtime >= xlsx_mtime for p in sidecars):
+            meals, costs = (pd.read_parquet(p) for p in sidecars)
+            return meals, costs
+    except Exception:
+        pass  # unreadable sidecar or no parquet engine: fall back to the workbook
+    meals, costs = _read_sheets(path, *sheets)
+    try:
+        for df, p in zip((meals, costs), sidecars):
+            df.to_parquet(p, index=False)
+    except Exception:
+        pass  # caching is best-effort (no pyarrow, read-only data dir, ...)
     return meals, costs
 
 # Node: normalize single ingredient
 def normalize_ingredient_node(name: str) -> str:
-    return name.strip().lower()
+    # interned: the vocabulary is tiny and reused across meals, pantry and cost lookup
+    return sys.intern(name.strip().lower())
 
 # Node: extract ingredients from a cell
 def extract_ingredients_node(cell) -> list:
-    if pd.isna(cell):
+    if cell is None or (isinstance(cell, float) and cell != cell):  # NaN != NaN; avoids pd.isna dispatch
         return []
     return [normalize_ingredient_node(p) for p in str(cell).split(";") if p.strip()]
 
+# Node: extract ingredients for a whole column in one vectorized pass (same rules as above)
+def extract_ingredients_column_node(cells: pd.Series) -> pd.Series:
+    parts = cells.fillna("").astype(str).str.lower().str.split(";")
+    return parts.map(lambda xs: [sys.intern(s.strip()) for s in xs if s.strip()])
+
 # Node: build cost lookup from costs_df
 def build_cost_lookup_node(costs_df: pd.DataFrame) -> dict:
-    lookup = {}
-    for _, r in costs_df.iterrows():
-        key = normalize_ingredient_node(r["Ingredient"])
-        try:
-            lookup[key] = float(r["UnitCost"])
-        except Exception:
-            lookup[key] = 0.0
-    return lookup
+    # Vectorized: normalize the key column and coerce costs in one pass (bad costs -> 0.0)
+    keys = costs_df["Ingredient"].astype(str).str.strip().str.lower()
+    unit_costs = pd.to_numeric(costs_df["UnitCost"], errors="coerce").fillna(0.0).astype(float)
+    return dict(zip(map(sys.intern, keys), unit_costs))
 
 # Node: day selector (accepts full day or 3-letter abbrev)
 def day_selector_node(day: str) -> str:
@@ -42,22 +88,35 @@ def day_selector_node(day: str) -> str:
         return ""
     return day.strip().lower()[:3]
 
+# Node: precompute normalized lookup columns once per meals table
+def prepare_meals_node(meals_df: pd.DataFrame) -> pd.DataFrame:
+    blank = pd.Series("", index=meals_df.index)
+    days = meals_df["DefaultDay"] if "DefaultDay" in meals_df else blank
+    cells = meals_df["Ingredients"] if "Ingredients" in meals_df else blank
+    return meals_df.assign(
+        _day_tok=days.astype(str).str.strip().str.lower().str[:3],
+        _ings=extract_ingredients_column_node(cells),
+    )
+
 # Node: meal lookup by day token
 def meal_lookup_node(meals_df: pd.DataFrame, day_token: str):
     if not day_token:
         return None
-    for _, r in meals_df.iterrows():
-        dd = str(r.get("DefaultDay", "")).strip().lower()
-        if dd.startswith(day_token):
-            return r
-    return None
+    if "_day_tok" not in meals_df:
+        meals_df = prepare_meals_node(meals_df)
+    # day_token is at most 3 chars, so a prefix match on _day_tok equals one on DefaultDay
+    hits = meals_df["_day_tok"].str.startswith(day_token).to_numpy().nonzero()[0]
+    return meals_df.iloc[hits[0]] if len(hits) else None
 
 # Node: cost report tool (given meal_row and cost_lookup)
 def cost_report_node(meal_row, cost_lookup: dict):
     if meal_row is None:
         return None
     name = meal_row.get("MealName", "<unknown>")
-    ings = extract_ingredients_node(meal_row.get("Ingredients", ""))
+    if "_ings" in meal_row:
+        ings = list(meal_row["_ings"])
+    else:
+        ings = extract_ingredients_node(meal_row.get("Ingredients", ""))
     total = 0.0
     missing_costs = []
     for ing in ings:
@@ -67,7 +126,8 @@ def cost_report_node(meal_row, cost_lookup: dict):
             missing_costs.append(ing)
     return {"MealName": name, "Ingredients": ings, "TotalEstimatedCost": total, "MissingCosts": missing_costs}
 
-# New node: ensure directories
+# New node: ensure directories (created once per process; mkdir is idempotent)
+@functools.lru_cache(maxsize=1)
 def _ensure_artifact_dirs():
     base = Path(__file__).resolve().parents[1]
     figs = base / "figures"
@@ -78,6 +138,8 @@ def _ensure_artifact_dirs():
 
 # New node: save a minimal diagram for the reflex agent
 def save_reflex_diagram(path=None):
+    # imported lazily: the tool paths never draw, and pyplot is slow to import
+    import matplotlib.pyplot as plt
     figs, _ = _ensure_artifact_dirs()
     if path is None:
         path = figs / "reflex_agent.png"
@@ -103,10 +165,16 @@ def write_run_log(filename: str, text: str):
     with open(out, "w", encoding="utf-8") as f:
         f.write(text)
 
+# Cached loader: parse the workbook once per (path, mtime) so repeated tool calls
+# reuse the in-memory DataFrames and cost lookup instead of re-reading the xlsx.
+@functools.lru_cache(maxsize=4)
+def _load_cached(path_str: str, mtime: float):
+    meals_df, costs_df = load_data_node(Path(path_str))
+    return prepare_meals_node(meals_df), costs_df, build_cost_lookup_node(costs_df)
+
 # High-level wrapper (composes nodes) — useful for LangChain Tool
 def reflex_day_lookup_tool(day: str):
-    meals_df, costs_df = load_data_node()
-    lookup = build_cost_lookup_node(costs_df)
+    meals_df, _, lookup = _load_cached(str(DATA_PATH), DATA_PATH.stat().st_mtime)
     tok = day_selector_node(day)
     meal_row = meal_lookup_node(meals_df, tok)
     report = cost_report_node(meal_row, lookup)
@@ -118,7 +186,7 @@ class SimpleReflexAgent:
     Simple wrapper that uses the single-purpose nodes defined above.
     """
     def __init__(self, meals_df: pd.DataFrame, costs_df: pd.DataFrame):
-        self.meals = meals_df
+        self.meals = prepare_meals_node(meals_df)
         # use the node that builds the lookup
         self.cost_lookup = build_cost_lookup_node(costs_df)
 
@@ -157,21 +225,16 @@ class GoalBasedAgent:
     Tie-break: smallest TotalIngredientCost, then MealName alphabetical.
     """
     def __init__(self, meals_df: pd.DataFrame, costs_df: pd.DataFrame):
-        self.meals = meals_df
-        self.cost_lookup = {}
-        for _, r in costs_df.iterrows():
-            key = normalize_ingredient(r["Ingredient"])
-            try:
-                self.cost_lookup[key] = float(r["UnitCost"])
-            except Exception:
-                self.cost_lookup[key] = 0.0
+        self.meals = prepare_meals_node(meals_df)
+        self.cost_lookup = build_cost_lookup_node(costs_df)
 
     def compute_costs(self, pantry: list):
-        pantry_set = {normalize_ingredient(p) for p in pantry}
+        pantry_set = {normalize_ingredient_node(p) for p in pantry}
         results = []
-        for _, r in self.meals.iterrows():
-            meal_name = r.get("MealName", "<unknown>")
-            ings = extract_ingredients(r.get("Ingredients", ""))
+        n = len(self.meals)
+        names = self.meals["MealName"].tolist() if "MealName" in self.meals else ["<unknown>"] * n
+        for meal_name, meal_ings in zip(names, self.meals["_ings"]):
+            ings = list(meal_ings)
             missing = [i for i in ings if i not in pantry_set]
             additional = sum(self.cost_lookup.get(i, 0.0) for i in missing)
             total_ing_cost = sum(self.cost_lookup.get(i, 0.0) for i in ings)
@@ -181,19 +244,14 @@ class GoalBasedAgent:
                 "MissingIngredients": missing,
                 "AdditionalCost": additional,
                 "TotalIngredientCost": total_ing_cost,
-                "Row": r
             })
         return results
 
     def select_min_additional(self, costs_list: list):
         if not costs_list:
             return None
-        # find minimum AdditionalCost
-        costs_list_sorted = sorted(
-            costs_list,
-            key=lambda x: (x["AdditionalCost"], x["TotalIngredientCost"], x["MealName"])
-        )
-        return costs_list_sorted[0]
+        # find minimum AdditionalCost (single pass, no sorted copy)
+        return min(costs_list, key=lambda x: (x["AdditionalCost"], x["TotalIngredientCost"], x["MealName"]))
 
 def demo_goal(agent: GoalBasedAgent, pantry: list, label: str):
     print(f"--- Goal-Based Demo: {label} ---")
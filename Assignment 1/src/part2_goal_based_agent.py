@@ -1,57 +1,143 @@
+import copy
+import functools
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import os
-import matplotlib.pyplot as plt
 from datetime import datetime
 
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except Exception:
+    _EXCEL_ENGINE = None
+
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "meals.xlsx"
 
+# Read sheets with the Rust calamine engine when installed (pandas >= 2.2); otherwise
+# fall back to one read-only openpyxl workbook (rows are streamed, workbook opened once)
+def _read_sheets(path: Path, *sheet_names):
+    if _EXCEL_ENGINE == "calamine":
+        with pd.ExcelFile(path, engine="calamine") as xl:
+            return [xl.parse(name) for name in sheet_names]
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        frames = []
+        for name in sheet_names:
+            rows = wb[name].iter_rows(values_only=True)
+            header = next(rows, ())
+            data = [r for r in rows if any(v is not None for v in r)]
+            frames.append(pd.DataFrame(data, columns=list(header)))
+        return frames
+    finally:
+        wb.close()
+
+# Parquet sidecar for one sheet, stored next to the workbook (e.g. data/meals.Meals.parquet)
+def _sidecar_path(path: Path, sheet: str) -> Path:
+    return path.with_name(f"{path.stem}.{sheet}.parquet")
+
 # Node: load data
 def load_data_node(path: Path = DATA_PATH):
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {path}")
-    meals = pd.read_excel(path, sheet_name="Meals")
-    costs = pd.read_excel(path, sheet_name="IngredientCosts")
+    sheets = ("Meals", "IngredientCosts")
+    sidecars = [_sidecar_path(path, s) for s in sheets]
+    # Reuse the parquet copies while they are newer than the workbook
+    xlsx_mtime = path.stat().st_mtime
+    try:
+        if all(p.exists() and p.stat().st_mtime >= xlsx_mtime for p in sidecars):
+            meals, costs = (pd.read_parquet(p) for p in sidecars)
+            return meals, costs
+    except Exception:
+        pass  # unreadable sidecar or no parquet engine: fall back to the workbook
+    meals, costs = _read_sheets(path, *sheets)
+    try:
+        for df, p in zip((meals, costs), sidecars):
+            df.to_parquet(p, index=False)
+    except Exception:
+        pass  # caching is best-effort (no pyarrow, read-only data dir, ...)
     return meals, costs
 
 # Node: normalize ingredient
 def normalize_ingredient_node(name: str) -> str:
-    return name.strip().lower()
+    # interned: the vocabulary is tiny and reused across meals, pantry and cost lookup
+    return sys.intern(name.strip().lower())
 
 # Node: extract ingredients from a cell
 def extract_ingredients_node(cell) -> list:
-    if pd.isna(cell):
+    if cell is None or (isinstance(cell, float) and cell != cell):  # NaN != NaN; avoids pd.isna dispatch
         return []
     return [normalize_ingredient_node(p) for p in str(cell).split(";") if p.strip()]
 
+# Node: extract ingredients for a whole column in one vectorized pass (same rules as above)
+def extract_ingredients_column_node(cells: pd.Series) -> pd.Series:
+    parts = cells.fillna("").astype(str).str.lower().str.split(";")
+    return parts.map(lambda xs: [sys.intern(s.strip()) for s in xs if s.strip()])
+
 # Node: build cost lookup
 def build_cost_lookup_node(costs_df: pd.DataFrame) -> dict:
-    lookup = {}
-    for _, r in costs_df.iterrows():
-        key = normalize_ingredient_node(r["Ingredient"])
-        try:
-            lookup[key] = float(r["UnitCost"])
-        except Exception:
-            lookup[key] = 0.0
-    return lookup
+    # Vectorized: normalize the key column and coerce costs in one pass (bad costs -> 0.0)
+    keys = costs_df["Ingredient"].astype(str).str.strip().str.lower()
+    unit_costs = pd.to_numeric(costs_df["UnitCost"], errors="coerce").fillna(0.0).astype(float)
+    return dict(zip(map(sys.intern, keys), unit_costs))
+
+# Node: precompute the pantry-independent per-meal data (parallel arrays, one entry per meal).
+# "presence" is an (M meals x K ingredients) count matrix and "unit_cost" the K-vector of costs,
+# so any per-meal cost sum is a single matrix-vector product.
+def build_meal_index_node(meals_df: pd.DataFrame, cost_lookup: dict) -> dict:
+    n = len(meals_df)
+    names = meals_df["MealName"].tolist() if "MealName" in meals_df else ["<unknown>"] * n
+    cells = meals_df["Ingredients"] if "Ingredients" in meals_df else pd.Series("", index=meals_df.index)
+    ings = [tuple(t) for t in extract_ingredients_column_node(cells)]
+    vocab = {}
+    for t in ings:
+        for i in t:
+            vocab.setdefault(i, len(vocab))
+    presence = np.zeros((n, len(vocab)))
+    for m, t in enumerate(ings):
+        for i in t:
+            presence[m, vocab[i]] += 1
+    unit_cost = np.array([cost_lookup.get(i, 0.0) for i in vocab], dtype=float)
+    return {
+        "names": names,
+        "ings": ings,
+        "ing_sets": [frozenset(t) for t in ings],
+        "vocab": vocab,
+        "presence": presence,
+        "unit_cost": unit_cost,
+        "total_cost": _cost_sums(presence, unit_cost),
+    }
+
+# Per-meal cost sums; rounding drops float summation noise (costs are currency amounts)
+def _cost_sums(presence: np.ndarray, unit_cost: np.ndarray) -> np.ndarray:
+    return np.round(presence @ unit_cost, 10)
 
 # Node: compute costs for every meal given pantry (single-purpose)
-def compute_costs_node(meals_df: pd.DataFrame, cost_lookup: dict, pantry: list):
-    pantry_set = {normalize_ingredient_node(p) for p in pantry}
+def compute_costs_node(meals_df: pd.DataFrame, cost_lookup: dict, pantry: list, meal_index: dict = None):
+    if meal_index is None:
+        meal_index = build_meal_index_node(meals_df, cost_lookup)
+    pantry_set = frozenset(normalize_ingredient_node(p) for p in pantry)
+    # AdditionalCost = TotalIngredientCost - cost already covered by the pantry; only the
+    # pantry's columns are touched (+ 0.0 turns a rounded -0.0 into 0.0)
+    vocab = meal_index["vocab"]
+    cols = [vocab[p] for p in pantry_set if p in vocab]
+    covered = _cost_sums(meal_index["presence"][:, cols], meal_index["unit_cost"][cols])
+    additional_costs = (np.round(meal_index["total_cost"] - covered, 10) + 0.0).tolist()
     results = []
-    for _, r in meals_df.iterrows():
-        meal_name = r.get("MealName", "<unknown>")
-        ings = extract_ingredients_node(r.get("Ingredients", ""))
-        missing = [i for i in ings if i not in pantry_set]
-        additional = sum(cost_lookup.get(i, 0.0) for i in missing)
-        total_ing_cost = sum(cost_lookup.get(i, 0.0) for i in ings)
+    rows = zip(meal_index["names"], meal_index["ings"], meal_index["ing_sets"],
+               additional_costs, meal_index["total_cost"].tolist())
+    for meal_name, ings, ing_set, additional, total_ing_cost in rows:
+        missing_set = ing_set - pantry_set
+        # keep the listed ingredient order for the report
+        missing = [i for i in ings if i in missing_set] if missing_set else []
         results.append({
             "MealName": meal_name,
-            "Ingredients": ings,
+            "Ingredients": list(ings),
             "MissingIngredients": missing,
             "AdditionalCost": additional,
             "TotalIngredientCost": total_ing_cost,
-            "Row": r
         })
     return results
 
@@ -59,19 +145,33 @@ def compute_costs_node(meals_df: pd.DataFrame, cost_lookup: dict, pantry: list):
 def argmin_selector_node(costs_list: list):
     if not costs_list:
         return None
-    return sorted(
-        costs_list,
-        key=lambda x: (x["AdditionalCost"], x["TotalIngredientCost"], x["MealName"])
-    )[0]
+    return min(costs_list, key=lambda x: (x["AdditionalCost"], x["TotalIngredientCost"], x["MealName"]))
 
-# High-level wrapper for LangChain Tool: takes pantry list and returns dict with best selection
-def goal_compute_tool(pantry: list):
-    meals_df, costs_df = load_data_node()
+# Cached loader: parse the workbook once per (path, mtime) so repeated tool calls
+# reuse the in-memory DataFrames and cost lookup instead of re-reading the xlsx.
+@functools.lru_cache(maxsize=4)
+def _load_cached(path_str: str, mtime: float):
+    meals_df, costs_df = load_data_node(Path(path_str))
     lookup = build_cost_lookup_node(costs_df)
-    costs = compute_costs_node(meals_df, lookup, pantry)
+    return meals_df, costs_df, lookup, build_meal_index_node(meals_df, lookup)
+
+# Memoized tool body: one entry per (normalized pantry, workbook version).
+# The cached dict is never handed out directly; goal_compute_tool returns a copy.
+@functools.lru_cache(maxsize=128)
+def _goal_compute_cached(pantry_set: frozenset, path_str: str, mtime: float):
+    meals_df, _, lookup, meal_index = _load_cached(path_str, mtime)
+    costs = compute_costs_node(meals_df, lookup, pantry_set, meal_index)
     best = argmin_selector_node(costs)
     return {"costs": costs, "best": best}
 
+# High-level wrapper for LangChain Tool: takes pantry list and returns dict with best selection
+def goal_compute_tool(pantry: list):
+    pantry_set = frozenset(normalize_ingredient_node(p) for p in pantry)
+    cached = _goal_compute_cached(pantry_set, str(DATA_PATH), DATA_PATH.stat().st_mtime)
+    # Fresh copy per call so a caller editing the result can't corrupt the cache
+    # ("best" stays the same object as its row in "costs")
+    return copy.deepcopy(cached)
+
 # Backward-compatible class API
 class GoalBasedAgent:
     """
@@ -82,14 +182,16 @@ class GoalBasedAgent:
     def __init__(self, meals_df: pd.DataFrame, costs_df: pd.DataFrame):
         self.meals = meals_df
         self.cost_lookup = build_cost_lookup_node(costs_df)
+        self.meal_index = build_meal_index_node(meals_df, self.cost_lookup)
 
     def compute_costs(self, pantry: list):
-        return compute_costs_node(self.meals, self.cost_lookup, pantry)
+        return compute_costs_node(self.meals, self.cost_lookup, pantry, self.meal_index)
 
     def select_min_additional(self, costs_list: list):
         return argmin_selector_node(costs_list)
 
-# New node: ensure artifact dirs (reuse pattern)
+# New node: ensure artifact dirs (reuse pattern; created once per process)
+@functools.lru_cache(maxsize=1)
 def _ensure_artifact_dirs():
     base = Path(__file__).resolve().parents[1]
     figs = base / "figures"
@@ -100,6 +202,8 @@ def _ensure_artifact_dirs():
 
 # New node: save a minimal diagram for the goal agent
 def save_goal_diagram(path=None):
+    # imported lazily: the tool paths never draw, and pyplot is slow to import
+    import matplotlib.pyplot as plt
     figs, _ = _ensure_artifact_dirs()
     if path is None:
         path = figs / "goal_agent.png"
@@ -1,8 +1,13 @@
-from typing import TypedDict, Optional, Dict, Any, List, Callable
+from typing import TypedDict, Optional, Dict, Any, List, Callable, Awaitable
+import asyncio
+import inspect
+import os
 
 default_model = None  # Will be set in main.py
+default_async_model = None  # Optional async twin of default_model
 
 from utils import color_prompt_blue, color_llm_green
+from agents import cache
 
 
 class BaseAgent:
@@ -12,19 +17,49 @@ class BaseAgent:
         model: Callable[[str, float], str] = None,
         system_prompt: str = "",
         temperature: float = 0.0,
+        async_model: Callable[[str, float], Awaitable[str]] = None,
     ):
         self.name = name
         self.model = model if model is not None else default_model
+        self.async_model = async_model if async_model is not None else default_async_model
         self.system_prompt = system_prompt.strip()
         self.temperature = temperature
         self.memory: List[Dict[str, str]] = []  # agent-private memory
+        # Resolved once here rather than inspecting the model on every call
+        self._model_takes_system = self._takes_system(self.model)
+        self._async_takes_system = self._takes_system(self.async_model)
+
+    @staticmethod
+    def _takes_system(fn) -> bool:
+        # Models that accept `system=` get the system prompt as a separate chat
+        # message (lets the server reuse its KV cache for that prefix)
+        try:
+            return fn is not None and "system" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def _invoke(self, fn, takes_system: bool, prompt: str, message: str):
+        if takes_system:
+            return fn(message, temperature=self.temperature, system=self.system_prompt or None)
+        return fn(prompt, temperature=self.temperature)
 
     def _build_prompt(self, message: str) -> str:
         if self.system_prompt:
             return self.system_prompt + "\n\n" + message
         return message
 
-    def call(self, message: str) -> str:
+    def _cache_key(self, message: str) -> Optional[str]:
+        # Only deterministic calls are worth replaying
+        if self.temperature != 0 or not cache.enabled():
+            return None
+        model_id = getattr(self.model, "__name__", type(self.model).__name__) + ":" + os.getenv("OLLAMA_QWEN_MODEL", "")
+        return cache.make_key(model_id, self._model_options(), self.system_prompt, message)
+
+    def _model_options(self) -> Dict[str, Any]:
+        # Generation options sent with every call; part of the cache key
+        return {"temperature": float(self.temperature)}
+
+    def _show_prompt(self, message: str) -> str:
         prompt = self._build_prompt(message)
         # Print the prompt for human inspection (blue) but send plain prompt to model
         try:
@@ -32,8 +67,9 @@ class BaseAgent:
         except Exception:
             # Fallback: printing without color if something goes wrong
             print(f"\n[{self.name} PROMPT]\n{prompt}\n")
+        return prompt
 
-        output = self.model(prompt, temperature=self.temperature)
+    def _record(self, message: str, output) -> str:
         if output is None:
             output = ""
         output = str(output)
@@ -49,5 +85,34 @@ class BaseAgent:
         self.memory.append({"role": "output", "content": output})
         return output
 
+    def call(self, message: str) -> str:
+        prompt = self._show_prompt(message)
+        key = self._cache_key(message)
+        output = cache.get(key) if key else None
+        if output is None:
+            output = self._invoke(self.model, self._model_takes_system, prompt, message)
+            if key and output is not None:
+                cache.put(key, str(output))
+        return self._record(message, output)
+
+    async def acall(self, message: str) -> str:
+        """Like `call`, but awaits the model so other requests can overlap the HTTP wait."""
+        prompt = self._show_prompt(message)
+        key = self._cache_key(message)
+        # sqlite3 blocks, so keep it off the event loop
+        output = await asyncio.to_thread(cache.get, key) if key else None
+        if output is None:
+            if self.async_model is not None:
+                output = await self._invoke(self.async_model, self._async_takes_system, prompt, message)
+            else:
+                output = await asyncio.to_thread(self._invoke, self.model, prompt, message)
+            if key and output is not None:
+                await asyncio.to_thread(cache.put, key, str(output))
+        return self._record(message, output)
+
     def act(self, state):
         raise NotImplementedError
+
+    async def act_async(self, state):
+        # Agents without a native async path run their blocking act() in a worker thread
+        return await asyncio.to_thread(self.act, state)
@@ -0,0 +1,72 @@
+"""
+Persistent response cache for agent model calls.
+
+Opt-in: cached outputs are replayed across runs, so benchmark numbers are only
+fresh with the cache off (the default). Only deterministic (temperature == 0)
+calls are cached. Entries live in a small SQLite file keyed by a hash of
+(model, model options, system prompt, user prompt), so replaying the same GSM8K
+split during development returns instantly.
+
+Env vars:
+- `AGENT_CACHE`: set to 1/true/yes to enable the cache.
+- `AGENT_CACHE_PATH`: SQLite file (default: `output/agent_cache.sqlite3`).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+_LOCK = threading.Lock()
+_CONN: Optional[sqlite3.Connection] = None
+
+
+def enabled() -> bool:
+    return os.getenv("AGENT_CACHE", "false").lower() in ("1", "true", "yes")
+
+
+def _conn() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        path = os.getenv("AGENT_CACHE_PATH", os.path.join("output", "agent_cache.sqlite3"))
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Agents may be called from worker threads (batch runners); all access goes through _LOCK
+        _CONN = sqlite3.connect(path, check_same_thread=False)
+        _CONN.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, ts INT)")
+        _CONN.commit()
+    return _CONN
+
+
+def make_key(model: str, options: dict, system: str, prompt: str) -> str:
+    opts = json.dumps(options, sort_keys=True)
+    return hashlib.blake2b(f"{model}|{opts}|{system}|{prompt}".encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    with _LOCK:
+        row = _conn().execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def put(key: str, value: str) -> None:
+    # Placeholder strings from a missing/failed server must not be replayed later
+    if value.startswith(("[ollama-", "[error]")):
+        return
+    with _LOCK:
+        conn = _conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, ts) VALUES (?, ?, ?)",
+            (key, value, int(time.time())),
+        )
+        conn.commit()
+
+
+def clear() -> None:
+    """Drop every cached response."""
+    with _LOCK:
+        conn = _conn()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
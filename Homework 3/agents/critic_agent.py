@@ -1,4 +1,5 @@
 from agents.base_agent import BaseAgent
+from agents.orchestrator_agent import Stage
 from utils import log_turn
 
 CRITIC_SYSTEM_PROMPT = """
@@ -13,19 +14,28 @@ You:
 """.strip()
 
 class CriticAgent(BaseAgent):
-    def __init__(self, model=None, temperature=0.1):
+    def __init__(self, model=None, temperature=0.1, async_model=None):
         super().__init__(
             name="Critic",
             model=model,
             system_prompt=CRITIC_SYSTEM_PROMPT,
             temperature=temperature,
+            async_model=async_model,
         )
 
-    def act(self, state):
+    def _prompt(self, state) -> str:
         report = state["validator_report"]
         llm_feedback = report.get("llm_critique", "")
-        prompt = f"""You are given validator feedback on a math solution.\n\nValidator feedback:\n{llm_feedback}\n\nWrite a clear set of corrections in bullet points, aimed at the solver.\nFocus on what to change, refine, or justify, step by step.\n"""
-        critique = self.call(prompt)
+        return f"""You are given validator feedback on a math solution.\n\nValidator feedback:\n{llm_feedback}\n\nWrite a clear set of corrections in bullet points, aimed at the solver.\nFocus on what to change, refine, or justify, step by step.\n"""
+
+    def _finish(self, state, critique: str):
         state["critic_report"] = critique
         log_turn(state, self.name, critique)
+        state["_stage"] = Stage.REFINER
         return state
+
+    def act(self, state):
+        return self._finish(state, self.call(self._prompt(state)))
+
+    async def act_async(self, state):
+        return self._finish(state, await self.acall(self._prompt(state)))
@@ -1,4 +1,5 @@
 from agents.base_agent import BaseAgent
+from agents.orchestrator_agent import Stage
 from utils import log_turn, extract_last_number
 
 EVALUATOR_SYSTEM_PROMPT = """
@@ -12,15 +13,16 @@ You:
 """.strip()
 
 class EvaluatorAgent(BaseAgent):
-    def __init__(self, model=None, temperature=0.0):
+    def __init__(self, model=None, temperature=0.0, async_model=None):
         super().__init__(
             name="Evaluator",
             model=model,
             system_prompt=EVALUATOR_SYSTEM_PROMPT,
             temperature=temperature,
+            async_model=async_model,
         )
 
-    def act(self, state):
+    def _metrics(self, state) -> None:
         original = state["initial_answer"]
         refined = state["refined_answer"]
         gold = state.get("solution_key")
@@ -48,8 +50,23 @@ class EvaluatorAgent(BaseAgent):
             base_ok is False and ref_ok is True
         ) if (base_ok is not None and ref_ok is not None) else None
         state["automatic_metrics"] = auto
-        prompt = f"""Evaluate the improvement from the original to the refined math solution.\n\nProblem:\n{state['question']}\n\nOriginal solution:\n{original}\n\nRefined solution:\n{refined}\n\nOptional gold numeric answer (may be None): {gold}\n\nScore the REFINED solution relative to the original on:\n- Correctness (0-10)\n- Rigor / soundness of reasoning (0-10)\n- Clarity (0-10)\n- Completeness (0-10)\n- Improvement over original (0-10)\n\nThen give:\n- Total score (0-50)\n- 2-4 sentence summary of what improved, what is still weak.\n\nFormat:\n\nScores:\n- Correctness: <0-10> - <short comment>\n- Rigor: <0-10> - <short comment>\n- Clarity: <0-10> - <short comment>\n- Completeness: <0-10> - <short comment>\n- Improvement: <0-10> - <short comment>\n\nTotal Score: <0-50>\n\nSummary:\n<2-4 sentences>\n"""
-        evaluation = self.call(prompt)
+
+    def _prompt(self, state) -> str:
+        original = state["initial_answer"]
+        refined = state["refined_answer"]
+        gold = state.get("solution_key")
+        return f"""Evaluate the improvement from the original to the refined math solution.\n\nProblem:\n{state['question']}\n\nOriginal solution:\n{original}\n\nRefined solution:\n{refined}\n\nOptional gold numeric answer (may be None): {gold}\n\nScore the REFINED solution relative to the original on:\n- Correctness (0-10)\n- Rigor / soundness of reasoning (0-10)\n- Clarity (0-10)\n- Completeness (0-10)\n- Improvement over original (0-10)\n\nThen give:\n- Total score (0-50)\n- 2-4 sentence summary of what improved, what is still weak.\n\nFormat:\n\nScores:\n- Correctness: <0-10> - <short comment>\n- Rigor: <0-10> - <short comment>\n- Clarity: <0-10> - <short comment>\n- Completeness: <0-10> - <short comment>\n- Improvement: <0-10> - <short comment>\n\nTotal Score: <0-50>\n\nSummary:\n<2-4 sentences>\n"""
+
+    def _finish(self, state, evaluation: str):
         state["evaluation"] = evaluation
         log_turn(state, self.name, evaluation)
+        state["_stage"] = Stage.END
         return state
+
+    def act(self, state):
+        self._metrics(state)
+        return self._finish(state, self.call(self._prompt(state)))
+
+    async def act_async(self, state):
+        self._metrics(state)
+        return self._finish(state, await self.acall(self._prompt(state)))
@@ -1,4 +1,5 @@
 from agents.base_agent import BaseAgent
+from agents.orchestrator_agent import Stage
 from utils import log_turn
 
 GENERATOR_SYSTEM_PROMPT = """
@@ -13,20 +14,28 @@ You:
 """.strip()
 
 from typing import Any, Optional
-import re
-from agents.tools import calculate_expression
+from agents.tools import calculate_expression, EXPR_RE, FINAL_ANSWER_RE, DIGIT_RE
+
+
+def _same_number(a: str, b: str) -> bool:
+    """True if both strings parse as the same number (commas ignored)."""
+    try:
+        return abs(float(a.replace(",", "")) - float(b.replace(",", ""))) < 1e-9
+    except (TypeError, ValueError):
+        return False
 
 
 class GeneratorAgent(BaseAgent):
-    def __init__(self, model=None, temperature=0.2):
+    def __init__(self, model=None, temperature=0.2, async_model=None):
         super().__init__(
             name="Generator",
             model=model,
             system_prompt=GENERATOR_SYSTEM_PROMPT,
             temperature=temperature,
+            async_model=async_model,
         )
 
-    def act(self, state: dict) -> dict:
+    def _prompt(self, state) -> str:
         question = state["question"]
 
         # 1) First model pass: generate a full solution / reasoning
@@ -37,28 +46,39 @@ class GeneratorAgent(BaseAgent):
             "At the end, clearly mark the final answer on its own line, e.g:",
             "Final Answer: <answer here>"
         ]
-        prompt = "\n\n".join(prompt_parts)
+        return "\n\n".join(prompt_parts)
 
-        first_out = self.call(prompt)
+    def _check_first(self, state, first_out: str) -> Optional[str]:
+        """Run the calculator over the first pass; return the second-pass prompt, or
+        None when the first pass already stands as the initial answer."""
         log_turn(state, self.name + "-pass1", first_out)
 
         # 2) Tool invocation: try to extract an expression from the model output
         tool_result: Optional[str] = None
+        candidate: Optional[str] = None
 
         # If model provides a "Final Answer: ..." line, try to evaluate that
-        final_line = re.search(r"Final Answer:\s*(.+)$", first_out, re.IGNORECASE | re.MULTILINE)
+        final_line = FINAL_ANSWER_RE.search(first_out)
         if final_line:
             candidate = final_line.group(1).strip()
-            if re.search(r"[0-9]", candidate):
+            if DIGIT_RE.search(candidate):
                 tool_result = calculate_expression(candidate)
 
         # Otherwise try to find a simple arithmetic expression inside the reasoning
         if tool_result is None:
-            expr_match = re.search(r"(-?\d+(?:\.\d+)?(?:\s*[+\-*/%^]\s*-?\d+(?:\.\d+)?)+)", first_out)
+            expr_match = EXPR_RE.search(first_out)
             if expr_match:
                 expr = expr_match.group(1)
                 tool_result = calculate_expression(expr)
 
+        # Skip the second (expensive) pass when it cannot add anything: the model gave a
+        # Final Answer and either there was nothing to compute or the tool agrees with it
+        if candidate is not None and (tool_result is None or _same_number(candidate, tool_result)):
+            state["tool_result"] = tool_result if tool_result is not None else "[no-tool-result]"
+            state["initial_answer"] = first_out
+            state["_stage"] = Stage.VALIDATOR
+            return None
+
         if tool_result is None:
             tool_result = "[no-tool-result]"
 
@@ -72,9 +92,24 @@ class GeneratorAgent(BaseAgent):
             f"Tool computation result:\n{tool_result}",
             "Please produce a final, self-contained solution and clearly mark the final answer line."
         ]
-        prompt2 = "\n\n".join(prompt2_parts)
+        return "\n\n".join(prompt2_parts)
 
-        final_out = self.call(prompt2)
+    def _finish(self, state, final_out: str):
         state["initial_answer"] = final_out
         log_turn(state, self.name + "-final", final_out)
+        state["_stage"] = Stage.VALIDATOR
         return state
+
+    def act(self, state: dict) -> dict:
+        prompt2 = self._check_first(state, self.call(self._prompt(state)))
+        if prompt2 is None:
+            return state
+        return self._finish(state, self.call(prompt2))
+
+    async def act_async(self, state: dict) -> dict:
+        # Both passes go through acall, i.e. the shared AsyncClient and its
+        # OLLAMA_NUM_PARALLEL semaphore, instead of a worker thread
+        prompt2 = self._check_first(state, await self.acall(self._prompt(state)))
+        if prompt2 is None:
+            return state
+        return self._finish(state, await self.acall(prompt2))
@@ -36,7 +36,7 @@ class OllamaLLM(LLM):
         return "ollama-qwen"
 
     def _call(self, prompt: str, stop: Optional[list] = None) -> str:  # type: ignore[override]
-        # Delegate to main.qwen_32b_model which handles python client or CLI
+        # Delegate to main.qwen_32b_model which handles python client or HTTP
         return qwen_32b_model(prompt, temperature=self.temperature)
 
     def _identifying_params(self) -> Dict[str, Any]:
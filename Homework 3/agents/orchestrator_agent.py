@@ -1,34 +1,38 @@
+from enum import IntEnum
+
 from agents.base_agent import BaseAgent
 from utils import log_turn
 
+
+class Stage(IntEnum):
+    """Pipeline progress, stored in `state["_stage"]`; each worker sets its successor."""
+    GENERATOR = 0
+    VALIDATOR = 1
+    CRITIC = 2
+    REFINER = 3
+    EVALUATOR = 4
+    END = 5
+
+
+_STAGES = ("generator", "validator", "critic", "refiner", "evaluator", "end")
+_LOG_MSGS = (
+    "Starting solution with Generator.",
+    "Sending solution to Validator.",
+    "Forwarding Validator report to Critic.",
+    "Sending corrections to Refiner.",
+    "Sending original vs refined to Evaluator.",
+    "Final answer ready.",
+)
+
+
 class OrchestratorAgent(BaseAgent):
     def decide_next(self, state) -> str:
-        if "initial_answer" not in state or not state["initial_answer"]:
-            return "generator"
-        if "validator_report" not in state or not state["validator_report"]:
-            return "validator"
-        if "critic_report" not in state or not state["critic_report"]:
-            return "critic"
-        if "refined_answer" not in state or not state["refined_answer"]:
-            return "refiner"
-        if "evaluation" not in state or not state["evaluation"]:
-            return "evaluator"
-        return "end"
+        return _STAGES[state.get("_stage", Stage.GENERATOR)]
 
     def act(self, state):
-        next_step = self.decide_next(state)
-        if next_step == "generator":
-            log_turn(state, "Orchestrator", "Starting solution with Generator.")
-        elif next_step == "validator":
-            log_turn(state, "Orchestrator", "Sending solution to Validator.")
-        elif next_step == "critic":
-            log_turn(state, "Orchestrator", "Forwarding Validator report to Critic.")
-        elif next_step == "refiner":
-            log_turn(state, "Orchestrator", "Sending corrections to Refiner.")
-        elif next_step == "evaluator":
-            log_turn(state, "Orchestrator", "Sending original vs refined to Evaluator.")
-        elif next_step == "end":
+        stage = state.get("_stage", Stage.GENERATOR)
+        if stage == Stage.END:
             final_ans = state.get("refined_answer") or state.get("initial_answer", "")
             state["final_answer"] = final_ans
-            log_turn(state, "Orchestrator", "Final answer ready.")
+        log_turn(state, "Orchestrator", _LOG_MSGS[stage])
         return state
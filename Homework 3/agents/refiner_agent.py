@@ -1,7 +1,9 @@
 from agents.base_agent import BaseAgent
-from utils import log_turn
-from agents.tools import calculate_expression
-import re
+from agents.orchestrator_agent import Stage
+from utils import log_turn, normalize_number, numeric_eq
+from agents.tools import calculate_expression, EXPR_RE, FINAL_ANSWER_RE, DIGIT_RE
+from typing import Optional
+
 
 REFINER_SYSTEM_PROMPT = """
 You are a Math Refiner.
@@ -16,19 +18,20 @@ You:
 
 
 class RefinerAgent(BaseAgent):
-    def __init__(self, model=None, temperature=0.3):
+    def __init__(self, model=None, temperature=0.3, async_model=None):
         super().__init__(
             name="Refiner",
             model=model,
             system_prompt=REFINER_SYSTEM_PROMPT,
             temperature=temperature,
+            async_model=async_model,
         )
 
-    def act(self, state):
+    def _prompt(self, state) -> str:
         original = state.get("initial_answer", "")
         corrections = state.get("critic_report", "")
 
-        prompt = f"""You will rewrite the solution to a math problem.
+        return f"""You will rewrite the solution to a math problem.
 
 Original solution:
 {original}
@@ -45,23 +48,32 @@ Write a new solution that:
 Final Answer: <answer here>
 """
 
-        # First model pass to produce a refined draft
-        draft = self.call(prompt)
+    def _check_draft(self, state, draft: str) -> Optional[str]:
+        """Verify the draft with the calculator; return the second-pass prompt, or
+        None when the draft already stands as the refined answer."""
         log_turn(state, self.name + "-draft", draft)
 
         # Try to extract a final answer or arithmetic expression from draft
         tool_result = None
-        final_match = re.search(r"Final Answer:\s*(.+)$", draft, re.IGNORECASE | re.MULTILINE)
+        final_match = FINAL_ANSWER_RE.search(draft)
         if final_match:
             candidate = final_match.group(1).strip()
-            if re.search(r"[0-9]", candidate):
+            if DIGIT_RE.search(candidate):
                 tool_result = calculate_expression(candidate)
 
         if tool_result is None:
-            expr_match = re.search(r"(-?\d+(?:\.\d+)?(?:\s*[+\-*/%^]\s*-?\d+(?:\.\d+)?)+)", draft)
+            expr_match = EXPR_RE.search(draft)
             if expr_match:
                 tool_result = calculate_expression(expr_match.group(1))
 
+        # Skip the second (expensive) pass when the tool just confirms the draft's answer
+        if tool_result is not None and not tool_result.startswith("[tool-error]"):
+            if numeric_eq(normalize_number(draft), normalize_number(tool_result)):
+                state["refiner_tool_result"] = tool_result
+                state["refined_answer"] = draft
+                state["_stage"] = Stage.EVALUATOR
+                return None
+
         if tool_result is None:
             tool_result = "[no-tool-result]"
 
@@ -73,7 +85,25 @@ Final Answer: <answer here>
             f"Draft:\n{draft}\n\nComputed result:\n{tool_result}\n\n"
             "Make any necessary corrections and clearly mark the final answer line."
         )
-        final_refined = self.call(prompt2)
+        return prompt2
+
+    def _finish(self, state, final_refined: str):
         state["refined_answer"] = final_refined
         log_turn(state, self.name + "-final", final_refined)
+        state["_stage"] = Stage.EVALUATOR
         return state
+
+    def act(self, state):
+        # First model pass to produce a refined draft
+        prompt2 = self._check_draft(state, self.call(self._prompt(state)))
+        if prompt2 is None:
+            return state
+        return self._finish(state, self.call(prompt2))
+
+    async def act_async(self, state):
+        # Same flow as act(); the calculator check is cheap (cached, compiled eval)
+        # so it runs inline on the loop between the two awaited model calls
+        prompt2 = self._check_draft(state, await self.acall(self._prompt(state)))
+        if prompt2 is None:
+            return state
+        return self._finish(state, await self.acall(prompt2))
@@ -7,43 +7,94 @@ This is intentionally minimal and can be replaced by a LangChain tool or
 external calculator later.
 """
 import ast
-import operator as op
-from typing import Any
-
-# Supported operators
-_OPERATORS = {
-    ast.Add: op.add,
-    ast.Sub: op.sub,
-    ast.Mult: op.mul,
-    ast.Div: op.truediv,
-    ast.Pow: op.pow,
-    ast.USub: op.neg,
-    ast.FloorDiv: op.floordiv,
-    ast.Mod: op.mod,
+import math
+import re
+from functools import lru_cache
+
+# Patterns the agents use to find something for calculate_expression, compiled once
+# here and shared by the generator and refiner
+EXPR_RE = re.compile(r"(-?\d+(?:\.\d+)?(?:\s*[+\-*/%^]\s*-?\d+(?:\.\d+)?)+)")
+FINAL_ANSWER_RE = re.compile(r"Final Answer:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+DIGIT_RE = re.compile(r"[0-9]")
+
+# Node types allowed in an expression; anything else (names, calls, attributes,
+# subscripts, ...) is rejected before the expression is compiled.
+_ALLOWED = {
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.USub,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Load,
 }
 
+# Largest exponent (by magnitude) accepted in `a ** b`; keeps inputs like 2**10**10 from hanging the agent
+_MAX_EXPONENT = 100
+# Largest result (in decimal digits) an expression may produce; nested powers such as
+# ((9**100)**100)**100 pass the exponent check but would still take forever
+_MAX_DIGITS = 4300
+
+
+def _validate(tree: ast.AST) -> None:
+    for node in ast.walk(tree):
+        if type(node) not in _ALLOWED:
+            raise ValueError(f"Unsupported expression: {type(node)}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            # Bound the exponent by value, so computed ones like (1+0.05)**(12*3) pass;
+            # compared in log10 space, i.e. 10 ** _digits(exp) <= _MAX_EXPONENT
+            if _digits(node.right) > math.log10(_MAX_EXPONENT):
+                raise ValueError(f"Exponent must be no larger than {_MAX_EXPONENT}")
+    if _digits(tree.body) > _MAX_DIGITS:
+        raise ValueError(f"Result would exceed {_MAX_DIGITS} digits")
+
 
-def _eval(node: ast.AST) -> Any:
-    if isinstance(node, ast.Expression):
-        return _eval(node.body)
-    if isinstance(node, ast.Num):  # type: ignore[attr-defined]
-        return node.n
-    if isinstance(node, ast.Constant):  # Python 3.8+
-        return node.value
-    if isinstance(node, ast.BinOp):
-        left = _eval(node.left)
-        right = _eval(node.right)
-        op_type = type(node.op)
-        if op_type in _OPERATORS:
-            return _OPERATORS[op_type](left, right)
-        raise ValueError(f"Unsupported binary operator: {op_type}")
+def _digits(node: ast.AST) -> float:
+    """Upper bound on log10 of the magnitude `node` can evaluate to (run after the node whitelist)."""
+    if isinstance(node, ast.Constant):
+        return math.log10(abs(node.value)) if node.value else 0.0
     if isinstance(node, ast.UnaryOp):
-        operand = _eval(node.operand)
-        op_type = type(node.op)
-        if op_type in _OPERATORS:
-            return _OPERATORS[op_type](operand)
-        raise ValueError(f"Unsupported unary operator: {op_type}")
-    raise ValueError(f"Unsupported expression: {type(node)}")
+        return _digits(node.operand)
+    left, right = max(_digits(node.left), 0.0), max(_digits(node.right), 0.0)
+    if isinstance(node.op, ast.Pow):
+        # |a ** b| <= |a| ** |b|, and |b| <= 10 ** right
+        return left * 10 ** right if right < 308 else math.inf
+    if isinstance(node.op, ast.Mult):
+        return left + right
+    if isinstance(node.op, (ast.Add, ast.Sub)):
+        # |a +- b| <= 2 * max(|a|, |b|)
+        return max(left, right) + math.log10(2)
+    # Div/FloorDiv/Mod never grow past their larger operand (true division gives a
+    # float, which overflows instead of hanging)
+    return max(left, right)
+
+
+def _calculate_impl(expr: str) -> str:
+    try:
+        # Parse expression only (no statements), whitelist its nodes, then let
+        # the interpreter do the arithmetic
+        parsed = ast.parse(expr, mode="eval")
+        _validate(parsed)
+        result = eval(compile(parsed, "<expr>", "eval"), {"__builtins__": {}}, {})
+        return str(result)
+    except Exception as e:
+        return f"[tool-error] {e}"
+
+
+# Results are deterministic strings, so repeated expressions are answered from memory
+@lru_cache(maxsize=4096)
+def _cached(expr_norm: str) -> str:
+    return _calculate_impl(expr_norm)
 
 
 def calculate_expression(expr: str) -> str:
@@ -52,10 +103,4 @@ def calculate_expression(expr: str) -> str:
     If the expression cannot be parsed or contains disallowed nodes, an error
     string is returned instead of raising.
     """
-    try:
-        # Parse expression only (no statements)
-        parsed = ast.parse(expr, mode="eval")
-        result = _eval(parsed)
-        return str(result)
-    except Exception as e:
-        return f"[tool-error] {e}"
+    return _cached(" ".join(expr.split()))
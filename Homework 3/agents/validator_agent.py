@@ -1,5 +1,8 @@
+import math
+
 from agents.base_agent import BaseAgent
-from utils import log_turn, extract_last_number, HAS_SYMPY
+from agents.orchestrator_agent import Stage
+from utils import log_turn, extract_last_number, HAS_SYMPY, to_float
 
 VALIDATOR_SYSTEM_PROMPT = """
 You are a strict mathematical validator and critic.
@@ -13,26 +16,32 @@ You:
 """.strip()
 
 class ValidatorAgent(BaseAgent):
-    def __init__(self, model=None, temperature=0.0):
+    def __init__(self, model=None, temperature=0.0, async_model=None):
         super().__init__(
             name="Validator",
             model=model,
             system_prompt=VALIDATOR_SYSTEM_PROMPT,
             temperature=temperature,
+            async_model=async_model,
         )
 
-    def act(self, state):
+    def _prompt(self, state) -> str:
         reasoning = state["initial_answer"]
-        predicted = extract_last_number(reasoning)
+        return f"""You are given a solution to a math problem.\n\nSolution:\n{reasoning}\n\nYour tasks:\n1. Check each step for:\n   - arithmetic errors\n   - algebraic errors\n   - logical inconsistencies\n   - misinterpretations of the question\n2. Identify any missing steps or unjustified assertions.\n3. Decide how confident you are that the final answer is correct.\n\nRespond in a JSON-like format (you don't have to be perfectly valid JSON):\n\nerrors: [\n  \"Description of issue 1...\",\n  \"Description of issue 2...\"\n]\nstrengths: [\n  \"Good property 1...\",\n  \"Good property 2...\"\n]\noverall_quality: \"high\" | \"medium\" | \"low\"\nrevision_instructions: \"Detailed, actionable guidance on how to improve the solution.\"\nconfidence: <0-100 integer, your confidence that the final answer is correct>\n"""
+
+    def _symbolic(self, state):
+        predicted = extract_last_number(state["initial_answer"])
         gold = state.get("solution_key")
         symbolic_ok = None
         if HAS_SYMPY and gold is not None and predicted is not None:
-            try:
-                symbolic_ok = float(predicted) == float(gold)
-            except Exception:
-                symbolic_ok = None
-        critique_prompt = f"""You are given a solution to a math problem.\n\nSolution:\n{reasoning}\n\nYour tasks:\n1. Check each step for:\n   - arithmetic errors\n   - algebraic errors\n   - logical inconsistencies\n   - misinterpretations of the question\n2. Identify any missing steps or unjustified assertions.\n3. Decide how confident you are that the final answer is correct.\n\nRespond in a JSON-like format (you don't have to be perfectly valid JSON):\n\nerrors: [\n  \"Description of issue 1...\",\n  \"Description of issue 2...\"\n]\nstrengths: [\n  \"Good property 1...\",\n  \"Good property 2...\"\n]\noverall_quality: \"high\" | \"medium\" | \"low\"\nrevision_instructions: \"Detailed, actionable guidance on how to improve the solution.\"\nconfidence: <0-100 integer, your confidence that the final answer is correct>\n"""
-        llm_critique = self.call(critique_prompt)
+            # Runners parse the key once into _gold_float; fall back for hand-built states
+            gold_f = state["_gold_float"] if "_gold_float" in state else to_float(gold)
+            if gold_f is not None:
+                symbolic_ok = math.isclose(float(predicted), gold_f, rel_tol=1e-9, abs_tol=1e-6)
+        return predicted, gold, symbolic_ok
+
+    def _finish(self, state, checked, llm_critique: str):
+        predicted, gold, symbolic_ok = checked
         validator_report = {
             "predicted_answer": predicted,
             "gold_answer": gold,
@@ -41,4 +50,24 @@ class ValidatorAgent(BaseAgent):
         }
         state["validator_report"] = validator_report
         log_turn(state, self.name, str(validator_report))
+        if symbolic_ok is True:
+            # Answer already matches the key: nothing for Critic/Refiner to fix,
+            # so the graph routes straight to the Evaluator
+            state["critic_report"] = "no changes needed"
+            state["refined_answer"] = state["initial_answer"]
+            state["_stage"] = Stage.EVALUATOR
+        else:
+            state["_stage"] = Stage.CRITIC
         return state
+
+    def act(self, state):
+        checked = self._symbolic(state)
+        if checked[2] is True:
+            return self._finish(state, checked, "[skipped: symbolic match]")
+        return self._finish(state, checked, self.call(self._prompt(state)))
+
+    async def act_async(self, state):
+        checked = self._symbolic(state)
+        if checked[2] is True:
+            return self._finish(state, checked, "[skipped: symbolic match]")
+        return self._finish(state, checked, await self.acall(self._prompt(state)))
@@ -14,16 +14,13 @@ Usage example at bottom of file.
 
 from __future__ import annotations
 
-from typing import TypedDict, Optional, Dict, Any, List, Callable
-import re
+from typing import TypedDict, Optional, Dict, Any, List, Tuple
 
 # Shared utilities (centralized to avoid circular imports)
-from utils import log_turn, extract_last_number, HAS_SYMPY
+from utils import to_float
 
 from langgraph.graph import StateGraph, END
-import os
-import subprocess
-import shlex
+import asyncio
 from dotenv import load_dotenv
 
 # Load environment variables from .env (if present)
@@ -51,29 +48,18 @@ class MathState(TypedDict, total=False):
     automatic_metrics: Dict[str, Any]
 
     # Dialogue log for transparency
-    dialogue: List[Dict[str, str]]  # [{ "speaker": "Generator", "content": "..." }, ...]
+    dialogue: List[Tuple[str, str]]  # [("Generator", "..."), ...]
+
+    # Pipeline progress (agents.orchestrator_agent.Stage); set by each worker
+    _stage: int
+    _gold_float: Optional[float]  # solution_key parsed at ingestion (None if absent/non-numeric)
 
 
 # ============================================================
 # 2. UTILITIES
 # ============================================================
 
-def extract_last_number(text: str) -> Optional[str]:
-    """
-    Extract the last integer or decimal number from text.
-    Very simple, but works fine for many math Q&A formats.
-    """
-    matches = re.findall(r"-?\d+(?:\.\d+)?", text)
-    if not matches:
-        return None
-    return matches[-1]
-
-
-def log_turn(state: MathState, speaker: str, content: str) -> None:
-    """Append a dialogue turn to the state's dialogue log."""
-    if "dialogue" not in state or state["dialogue"] is None:
-        state["dialogue"] = []
-    state["dialogue"].append({"speaker": speaker, "content": content})
+# Parsing/logging helpers shared with the agents live in utils.py.
 
 
 # ============================================================
@@ -81,71 +67,12 @@ def log_turn(state: MathState, speaker: str, content: str) -> None:
 # ============================================================
 
 
-# Qwen 32B model integration (pseudo-code, replace with actual API)
-def qwen_32b_model(prompt: str, temperature: float = 0.0) -> str:
-    """Run a local Qwen model via the Ollama Python client (preferred) or CLI.
-
-    Behavior:
-    - Reads env var `OLLAMA_QWEN_MODEL` for the model name (default: `qwen2:32b`).
-    - Calls `ollama run <model> --no-stream --prompt '<prompt>' --temperature <t>`.
-    - Returns the stdout on success, or a helpful error string on failure.
-
-    This keeps the integration optional: if Ollama or the model isn't available,
-    the function returns an informative placeholder string instead of raising.
-    """
-    model_name = os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b")
-
-    use_python_client = os.getenv("USE_OLLAMA_PYTHON_CLIENT", "false").lower() in ("1", "true", "yes")
-
-    # 1) Try Python client if requested
-    if use_python_client:
-        try:
-            import ollama
-            # Try common client APIs dynamically
-            try:
-                # preferred API: ollama.chat or ollama.generate
-                if hasattr(ollama, "chat"):
-                    resp = ollama.chat(model=model_name, prompt=prompt, temperature=float(temperature))
-                    return str(resp)
-                if hasattr(ollama, "generate"):
-                    resp = ollama.generate(model=model_name, prompt=prompt, temperature=float(temperature))
-                    return str(resp)
-                # fallback: look for a client class
-                if hasattr(ollama, "Ollama"):
-                    client = ollama.Ollama()
-                    if hasattr(client, "chat"):
-                        resp = client.chat(model=model_name, prompt=prompt, temperature=float(temperature))
-                        return str(resp)
-                    if hasattr(client, "generate"):
-                        resp = client.generate(model=model_name, prompt=prompt, temperature=float(temperature))
-                        return str(resp)
-            except Exception as e:
-                # If python client exists but call failed, return informative message
-                return f"[ollama-py-error] {e}"
-        except Exception:
-            # Python client not available or import failed; fall back to CLI below
-            pass
-
-    # 2) Fallback to CLI invocation (previous behavior)
-    # Some ollama versions don't support `--no-stream`; call with the more
-    # broadly-supported flags and include temperature if available.
-    # Ollama CLI expects: `ollama run MODEL [PROMPT]` (prompt is positional)
-    cmd = ["ollama", "run", model_name, prompt]
-
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if proc.returncode == 0:
-            return proc.stdout.strip()
-        err = proc.stderr.strip() or proc.stdout.strip()
-        return f"[ollama-error] {err}"
-    except FileNotFoundError:
-        return "[ollama-missing] ollama CLI not found in PATH"
-    except subprocess.TimeoutExpired:
-        return "[ollama-error] ollama run timed out"
-    except Exception as e:
-        return f"[ollama-error] {e}"
+# Client setup and the sync/async model functions live in ollama_client (shared
+# with main_gsm8k); the async one runs inside `async_session()`.
+from ollama_client import qwen_32b_model, qwen_32b_model_async, async_session, clear_memo
 
 MODEL = qwen_32b_model
+ASYNC_MODEL = qwen_32b_model_async
 
 
 # ============================================================
@@ -172,58 +99,36 @@ from agents.evaluator_agent import EvaluatorAgent
 
 # Create global agent instances, passing model and temperature
 orchestrator = OrchestratorAgent(name="Orchestrator", model=MODEL, temperature=0.0)
-generator = GeneratorAgent(model=MODEL, temperature=0.2)
-validator = ValidatorAgent(model=MODEL, temperature=0.0)
-critic = CriticAgent(model=MODEL, temperature=0.1)
-refiner = RefinerAgent(model=MODEL, temperature=0.3)
-evaluator = EvaluatorAgent(model=MODEL, temperature=0.0)
-
-
-def orchestrator_node(state: MathState) -> MathState:
-    """Wrapper to use OrchestratorAgent inside LangGraph."""
-    return orchestrator.act(state)
-
-
-def orchestrator_router(state: MathState) -> str:
-    """Router for conditional edges out of the orchestrator node."""
-    return orchestrator.decide_next(state)
-
-
-def generator_node(state: MathState) -> MathState:
-    return generator.act(state)
-
-
-def validator_node(state: MathState) -> MathState:
-    return validator.act(state)
+generator = GeneratorAgent(model=MODEL, temperature=0.2, async_model=ASYNC_MODEL)
+validator = ValidatorAgent(model=MODEL, temperature=0.0, async_model=ASYNC_MODEL)
+critic = CriticAgent(model=MODEL, temperature=0.1, async_model=ASYNC_MODEL)
+refiner = RefinerAgent(model=MODEL, temperature=0.3, async_model=ASYNC_MODEL)
+evaluator = EvaluatorAgent(model=MODEL, temperature=0.0, async_model=ASYNC_MODEL)
 
 
-def critic_node(state: MathState) -> MathState:
-    return critic.act(state)
-
-
-def refiner_node(state: MathState) -> MathState:
-    return refiner.act(state)
-
-
-def evaluator_node(state: MathState) -> MathState:
-    return evaluator.act(state)
-
-
-def build_app():
+def build_app(use_async: bool = False):
     workflow = StateGraph(MathState)
 
-    workflow.add_node("orchestrator", orchestrator_node)
-    workflow.add_node("generator", generator_node)
-    workflow.add_node("validator", validator_node)
-    workflow.add_node("critic", critic_node)
-    workflow.add_node("refiner", refiner_node)
-    workflow.add_node("evaluator", evaluator_node)
+    # Bound agent methods are registered as nodes/routers directly (no wrapper functions)
+    workflow.add_node("orchestrator", orchestrator.act)
+    if use_async:
+        workflow.add_node("generator", generator.act_async)
+        workflow.add_node("validator", validator.act_async)
+        workflow.add_node("critic", critic.act_async)
+        workflow.add_node("refiner", refiner.act_async)
+        workflow.add_node("evaluator", evaluator.act_async)
+    else:
+        workflow.add_node("generator", generator.act)
+        workflow.add_node("validator", validator.act)
+        workflow.add_node("critic", critic.act)
+        workflow.add_node("refiner", refiner.act)
+        workflow.add_node("evaluator", evaluator.act)
 
     workflow.set_entry_point("orchestrator")
 
     workflow.add_conditional_edges(
         "orchestrator",
-        orchestrator_router,
+        orchestrator.decide_next,
         {
             "generator": "generator",
             "validator": "validator",
@@ -234,9 +139,14 @@ def build_app():
         },
     )
 
-    # Linear pipeline between worker agents
+    # Linear pipeline between worker agents; the validator may skip ahead to the
+    # evaluator when the answer already matches the key (symbolic fast path)
     workflow.add_edge("generator", "validator")
-    workflow.add_edge("validator", "critic")
+    workflow.add_conditional_edges(
+        "validator",
+        orchestrator.decide_next,
+        {"critic": "critic", "evaluator": "evaluator"},
+    )
     workflow.add_edge("critic", "refiner")
     workflow.add_edge("refiner", "evaluator")
     workflow.add_edge("evaluator", "orchestrator")  # go back to orchestrator to finish
@@ -245,6 +155,7 @@ def build_app():
 
 
 app = build_app()
+async_app = build_app(use_async=True)
 
 
 # ============================================================
@@ -265,15 +176,42 @@ def solve_math_problem(
     Returns:
         final_state: MathState containing all intermediate artifacts.
     """
+    clear_memo()  # temperature-0 replies are reused within this example only
     initial_state: MathState = {
         "question": question,
         "solution_key": solution_key,
+        "_gold_float": to_float(solution_key),  # parsed once; the validator compares against it
         "dialogue": [],
     }
     final_state = app.invoke(initial_state)
     return final_state
 
 
+async def solve_math_problems_async(
+    problems: List[Tuple[str, Optional[str]]],
+) -> List[MathState]:
+    """
+    Run the pipeline over many (question, solution_key) pairs concurrently.
+
+    Stages within one problem still run in order (each consumes the previous
+    stage's output); the overlap comes from different problems waiting on the
+    model at the same time, bounded by OLLAMA_NUM_PARALLEL.
+    """
+    states = [
+        {"question": q, "solution_key": key, "_gold_float": to_float(key), "dialogue": []}
+        for q, key in problems
+    ]
+    # One AsyncClient for the whole batch, closed (with its connections) afterwards
+    clear_memo()
+    async with async_session():
+        return await asyncio.gather(*(async_app.ainvoke(st) for st in states))
+
+
+def solve_math_problems(problems: List[Tuple[str, Optional[str]]]) -> List[MathState]:
+    """Blocking wrapper around `solve_math_problems_async`."""
+    return asyncio.run(solve_math_problems_async(problems))
+
+
 # ============================================================
 # 8. EXAMPLE USAGE
 # ============================================================
@@ -302,5 +240,5 @@ if __name__ == "__main__":
     print(final.get("evaluation", ""))
 
     print("\n================= DIALOGUE LOG =================\n")
-    for turn in final.get("dialogue", []):
-        print(f"[{turn['speaker']}] {turn['content']}\n")
+    for speaker, content in final.get("dialogue", []):
+        print(f"[{speaker}] {content}\n")
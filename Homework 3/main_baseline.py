@@ -16,127 +16,116 @@ import csv
 from dotenv import load_dotenv
 load_dotenv()
 
-# Model runner (same fallback behavior as main files)
-import subprocess
+# Model runner (same HTTP/python-client behavior as main files)
+import requests
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+if not OLLAMA_HOST.startswith(("http://", "https://")):
+    OLLAMA_HOST = "http://" + OLLAMA_HOST
+
+_SESSION = requests.Session()
+_OLLAMA_CLIENT = None
+
+# How long the server keeps the model loaded after a request (see utils.ollama_keep_alive)
+from utils import ollama_keep_alive
+OLLAMA_KEEP_ALIVE = ollama_keep_alive()
 
 
 def qwen_model_run(prompt: str, model_name: str, use_python_client: bool = False, temperature: float = 0.0) -> str:
-    # try python client
+    global _OLLAMA_CLIENT
+    options = {"temperature": float(temperature)}
+    # try python client (one instance per process)
     if use_python_client:
-        try:
-            import ollama
-            if hasattr(ollama, "chat"):
-                return str(ollama.chat(model=model_name, prompt=prompt, temperature=float(temperature)))
-            if hasattr(ollama, "generate"):
-                return str(ollama.generate(model=model_name, prompt=prompt, temperature=float(temperature)))
-            if hasattr(ollama, "Ollama"):
-                client = ollama.Ollama()
-                if hasattr(client, "chat"):
-                    return str(client.chat(model=model_name, prompt=prompt, temperature=float(temperature)))
-                if hasattr(client, "generate"):
-                    return str(client.generate(model=model_name, prompt=prompt, temperature=float(temperature)))
-        except Exception:
-            pass
-    # CLI fallback
-    cmd = ["ollama", "run", model_name, prompt]
+        if _OLLAMA_CLIENT is None:
+            try:
+                import ollama
+                _OLLAMA_CLIENT = ollama.Client(host=OLLAMA_HOST)
+            except Exception:
+                _OLLAMA_CLIENT = False
+        if _OLLAMA_CLIENT:
+            try:
+                resp = _OLLAMA_CLIENT.generate(model=model_name, prompt=prompt, stream=False, keep_alive=OLLAMA_KEEP_ALIVE, options=options)
+                return str(resp["response"]).strip()
+            except Exception:
+                pass
+    # HTTP fallback over a keep-alive session
+    payload = {"model": model_name, "prompt": prompt, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE, "options": options}
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if proc.returncode == 0:
-            return proc.stdout.strip()
-        return proc.stderr.strip() or proc.stdout.strip()
+        resp = _SESSION.post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=300)
+        if resp.status_code == 200:
+            return resp.json().get("response", "").strip()
+        return resp.text.strip()
     except Exception as e:
         return f"[error] {e}"
 
 
-# helpers copied/adapted from main_gsm8k
-import re
-from utils import strip_ansi, extract_last_number
-
-
-def normalize_number(s: str):
-    if s is None:
-        return None
-    s = str(s).strip()
-    s = s.replace(",", "")
-    s = s.replace("$", "")
-    s = s.rstrip(".\n ")
-    try:
-        if "." in s:
-            return float(s)
-        return int(s)
-    except Exception:
-        last = extract_last_number(s)
-        if last is None:
-            return None
-        try:
-            if "." in last:
-                return float(last)
-            return int(last)
-        except Exception:
-            return None
-
-
-def numeric_eq(a, b):
-    if a is None or b is None:
-        return False
-    try:
-        af = float(a)
-        bf = float(b)
-        return abs(af - bf) < 1e-6
-    except Exception:
-        return str(a).strip() == str(b).strip()
+# helpers shared with main_gsm8k (see utils)
+from utils import normalize_number, numeric_eq, json_dumps
 
 
 # Runner
-from datasets import load_dataset
-from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 
 
-def run_baseline(model_name: str, use_python_client: bool, split: str = "test", max_examples: int = None, temperature: float = 0.0):
-    # load GSM8K
+def run_baseline(model_name: str, use_python_client: bool, split: str = "test", max_examples: int = None, temperature: float = 0.0, concurrency: int = 1):
+    # Heavy imports stay here so importing this module (e.g. for qwen_model_run) stays cheap
+    from datasets import load_dataset
+    from tqdm import tqdm
+
+    # load GSM8K into memory and pull the needed rows out column-wise in one conversion
     try:
-        ds = load_dataset("gsm8k", split=split)
+        ds = load_dataset("gsm8k", split=split, keep_in_memory=True)
     except Exception:
-        ds = load_dataset("gsm8k", "main", split=split)
+        ds = load_dataset("gsm8k", "main", split=split, keep_in_memory=True)
 
     n = len(ds)
     print(f"Loaded GSM8K split={split} with {n} examples")
-    if max_examples is not None:
-        ds = ds.select(range(min(max_examples, n)))
+    rows = ds[: n if max_examples is None else min(max_examples, n)]
+    questions, golds = rows["question"], rows["answer"]
 
     os.makedirs("output", exist_ok=True)
     results_path = os.path.join("output", "gsm8k_baseline_results.jsonl")
     summary_path = os.path.join("output", "gsm8k_baseline_summary.csv")
 
-    results_f = open(results_path, "w", encoding="utf-8")
+    results_f = open(results_path, "wb")
 
     total = 0
     correct = 0
     failures = []
+    entries = []  # kept in memory so the summary doesn't re-read results_path
 
-    for ex in tqdm(ds, desc="GSM8K"):
-        total += 1
-        question = ex.get("question")
-        gold_raw = ex.get("answer")
-        gold_norm = normalize_number(gold_raw)
-
-        # build a simple prompt
-        prompt = (
+    def build_prompt(question):
+        return (
             "You are a careful math solver. Answer the problem and put the final answer on its own line like:\nFinal Answer: <answer>\n\n"
             f"Problem:\n{question}\n"
         )
-        out = qwen_model_run(prompt, model_name=model_name, use_python_client=use_python_client, temperature=temperature)
-
-        # clean and extract
-        out_plain = strip_ansi(out)
-        pred = normalize_number(out_plain)
-        correct_flag = numeric_eq(pred, gold_norm)
-        if correct_flag:
-            correct += 1
-        else:
-            failures.append({"question": question, "gold": gold_raw, "pred": pred, "raw_output": out_plain[:1000]})
 
-        results_f.write(json.dumps({"question": question, "gold": gold_raw, "pred": pred, "correct": correct_flag}, ensure_ascii=False) + "\n")
+    def run_one(question):
+        return qwen_model_run(build_prompt(question), model_name=model_name, use_python_client=use_python_client, temperature=temperature)
+
+    # Keep up to `concurrency` requests in flight so the server can batch them;
+    # pool.map yields outputs in dataset order, so results stay in order too.
+    concurrency = max(1, concurrency)
+    _SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+    _SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outputs = pool.map(run_one, questions)
+        for question, gold_raw, out in tqdm(zip(questions, golds, outputs), total=len(questions), desc="GSM8K"):
+            total += 1
+            gold_norm = normalize_number(gold_raw)
+
+            # HTTP/python-client output is plain text (no terminal colors), so no ANSI strip pass
+            pred = normalize_number(out)
+            correct_flag = numeric_eq(pred, gold_norm)
+            if correct_flag:
+                correct += 1
+            else:
+                failures.append({"question": question, "gold": gold_raw, "pred": pred, "raw_output": out[:1000]})
+
+            entry = {"question": question, "gold": gold_raw, "pred": pred, "correct": correct_flag}
+            entries.append(entry)
+            results_f.write(json_dumps(entry) + b"\n")
 
     results_f.close()
     with open(summary_path, "w", newline="", encoding="utf-8") as csvf:
@@ -156,20 +145,10 @@ def run_baseline(model_name: str, use_python_client: bool, split: str = "test",
 
     # write timestamped JSON summary
     try:
-        from datetime import datetime
-        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        from datetime import datetime, timezone
+        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         model_used = model_name
         out_path = os.path.join("output", f"gsm8k_baseline_{ts}.json")
-        entries = []
-        try:
-            with open(results_path, "r", encoding="utf-8") as rf:
-                for line in rf:
-                    try:
-                        entries.append(json.loads(line))
-                    except Exception:
-                        pass
-        except Exception:
-            entries = []
 
         summary_obj = {
             "timestamp": ts,
@@ -180,8 +159,8 @@ def run_baseline(model_name: str, use_python_client: bool, split: str = "test",
             "accuracy": float(correct) / float(total) if total else None,
             "entries": entries,
         }
-        with open(out_path, "w", encoding="utf-8") as of:
-            json.dump(summary_obj, of, ensure_ascii=False, indent=2)
+        with open(out_path, "wb") as of:
+            of.write(json_dumps(summary_obj, indent=True))
         print(f"Timestamped baseline JSON written to: {out_path}")
     except Exception as e:
         print(f"Failed to write baseline timestamped JSON: {e}")
@@ -194,6 +173,8 @@ if __name__ == "__main__":
     ap.add_argument("--split", default="test")
     ap.add_argument("--max-examples", type=int, default=2)
     ap.add_argument("--temperature", type=float, default=0.0)
+    ap.add_argument("--concurrency", type=int, default=int(os.getenv("OLLAMA_NUM_PARALLEL", "4")),
+                    help="Requests kept in flight; match the server's OLLAMA_NUM_PARALLEL (and run it with OLLAMA_MAX_LOADED_MODELS=1)")
     args = ap.parse_args()
 
-    run_baseline(model_name=args.model, use_python_client=args.use_ollama_py, split=args.split, max_examples=args.max_examples, temperature=args.temperature)
+    run_baseline(model_name=args.model, use_python_client=args.use_ollama_py, split=args.split, max_examples=args.max_examples, temperature=args.temperature, concurrency=args.concurrency)
@@ -14,17 +14,13 @@ by the quick-run below).
 
 from __future__ import annotations
 
-from typing import TypedDict, Optional, Dict, Any, List, Callable
-import re
+from typing import TypedDict, Optional, Dict, Any, List, Tuple
 import os
-import subprocess
-import shlex
+import asyncio
 from dotenv import load_dotenv
 
 # Shared utilities (centralized to avoid circular imports)
-from utils import log_turn, extract_last_number, HAS_SYMPY, strip_ansi
-
-from langgraph.graph import StateGraph, END
+from utils import to_float, normalize_number, numeric_eq, json_dumps, json_loads
 
 # Load environment variables from .env (if present)
 load_dotenv()
@@ -64,30 +60,18 @@ class MathState(TypedDict, total=False):
     automatic_metrics: Dict[str, Any]
 
     # Dialogue log for transparency
-    dialogue: List[Dict[str, str]]  # [{ "speaker": "Generator", "content": "..." }, ...]
+    dialogue: List[Tuple[str, str]]  # [("Generator", "..."), ...]
+
+    # Pipeline progress (agents.orchestrator_agent.Stage); set by each worker
+    _stage: int
+    _gold_float: Optional[float]  # solution_key parsed at ingestion (None if absent/non-numeric)
 
 
 # ============================================================
 # 2. UTILITIES
 # ============================================================
 
-
-def extract_last_number(text: str) -> Optional[str]:
-    """
-    Extract the last integer or decimal number from text.
-    Very simple, but works fine for many math Q&A formats.
-    """
-    matches = re.findall(r"-?\d+(?:\.\d+)?", text)
-    if not matches:
-        return None
-    return matches[-1]
-
-
-def log_turn(state: MathState, speaker: str, content: str) -> None:
-    """Append a dialogue turn to the state's dialogue log."""
-    if "dialogue" not in state or state["dialogue"] is None:
-        state["dialogue"] = []
-    state["dialogue"].append({"speaker": speaker, "content": content})
+# Parsing/logging helpers shared with the agents live in utils.py.
 
 
 # ============================================================
@@ -95,66 +79,12 @@ def log_turn(state: MathState, speaker: str, content: str) -> None:
 # ============================================================
 
 
-# Qwen 32B model integration (pseudo-code, replace with actual API)
-def qwen_32b_model(prompt: str, temperature: float = 0.0) -> str:
-    """Run a local Qwen model via the Ollama Python client (preferred) or CLI.
-
-    Behavior:
-    - Reads env var `OLLAMA_QWEN_MODEL` for the model name (default: `qwen2:32b`).
-    - Calls `ollama run <model> <prompt>`.
-    - Returns the stdout on success, or a helpful error string on failure.
-    """
-    model_name = os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b")
-
-    use_python_client = os.getenv("USE_OLLAMA_PYTHON_CLIENT", "false").lower() in ("1", "true", "yes")
-
-    # 1) Try Python client if requested
-    if use_python_client:
-        try:
-            import ollama
-            # Try common client APIs dynamically
-            try:
-                # preferred API: ollama.chat or ollama.generate
-                if hasattr(ollama, "chat"):
-                    resp = ollama.chat(model=model_name, prompt=prompt, temperature=float(temperature))
-                    return str(resp)
-                if hasattr(ollama, "generate"):
-                    resp = ollama.generate(model=model_name, prompt=prompt, temperature=float(temperature))
-                    return str(resp)
-                # fallback: look for a client class
-                if hasattr(ollama, "Ollama"):
-                    client = ollama.Ollama()
-                    if hasattr(client, "chat"):
-                        resp = client.chat(model=model_name, prompt=prompt, temperature=float(temperature))
-                        return str(resp)
-                    if hasattr(client, "generate"):
-                        resp = client.generate(model=model_name, prompt=prompt, temperature=float(temperature))
-                        return str(resp)
-            except Exception as e:
-                # If python client exists but call failed, return informative message
-                return f"[ollama-py-error] {e}"
-        except Exception:
-            # Python client not available or import failed; fall back to CLI below
-            pass
-
-    # 2) Fallback to CLI invocation (previous behavior)
-    cmd = ["ollama", "run", model_name, prompt]
-
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if proc.returncode == 0:
-            return proc.stdout.strip()
-        err = proc.stderr.strip() or proc.stdout.strip()
-        return f"[ollama-error] {err}"
-    except FileNotFoundError:
-        return "[ollama-missing] ollama CLI not found in PATH"
-    except subprocess.TimeoutExpired:
-        return "[ollama-error] ollama run timed out"
-    except Exception as e:
-        return f"[ollama-error] {e}"
-
+# Client setup and the sync/async model functions live in ollama_client (shared
+# with main.py). Imported only after the early CLI overrides above are applied.
+from ollama_client import qwen_32b_model, qwen_32b_model_async, async_session, clear_memo, warm_model
 
 MODEL = qwen_32b_model
+ASYNC_MODEL = qwen_32b_model_async
 
 
 # ============================================================
@@ -173,88 +103,50 @@ from agents.evaluator_agent import EvaluatorAgent
 
 
 # ============================================================
-# 6. BUILD LANGGRAPH WORKFLOW
+# 6. PIPELINE
 # ============================================================
 
 
 
 # Create global agent instances, passing model and temperature
 orchestrator = OrchestratorAgent(name="Orchestrator", model=MODEL, temperature=0.0)
-generator = GeneratorAgent(model=MODEL, temperature=0.2)
-validator = ValidatorAgent(model=MODEL, temperature=0.0)
-critic = CriticAgent(model=MODEL, temperature=0.1)
-refiner = RefinerAgent(model=MODEL, temperature=0.3)
-evaluator = EvaluatorAgent(model=MODEL, temperature=0.0)
-
-
-def orchestrator_node(state: MathState) -> MathState:
-    """Wrapper to use OrchestratorAgent inside LangGraph."""
+generator = GeneratorAgent(model=MODEL, temperature=0.2, async_model=ASYNC_MODEL)
+validator = ValidatorAgent(model=MODEL, temperature=0.0, async_model=ASYNC_MODEL)
+critic = CriticAgent(model=MODEL, temperature=0.1, async_model=ASYNC_MODEL)
+refiner = RefinerAgent(model=MODEL, temperature=0.3, async_model=ASYNC_MODEL)
+evaluator = EvaluatorAgent(model=MODEL, temperature=0.0, async_model=ASYNC_MODEL)
+
+
+_WORKERS = {
+    "generator": generator,
+    "validator": validator,
+    "critic": critic,
+    "refiner": refiner,
+    "evaluator": evaluator,
+}
+
+
+# The topology is fixed (orchestrator -> workers in `_stage` order -> orchestrator),
+# so it is walked directly instead of going through a compiled StateGraph; main.py
+# keeps the LangGraph version of the same routing.
+def run_pipeline(state: MathState) -> MathState:
+    state = orchestrator.act(state)
+    nxt = orchestrator.decide_next(state)
+    while nxt != "end":
+        state = _WORKERS[nxt].act(state)
+        nxt = orchestrator.decide_next(state)
+    return orchestrator.act(state)  # sets final_answer
+
+
+async def arun_pipeline(state: MathState) -> MathState:
+    state = orchestrator.act(state)
+    nxt = orchestrator.decide_next(state)
+    while nxt != "end":
+        state = await _WORKERS[nxt].act_async(state)
+        nxt = orchestrator.decide_next(state)
     return orchestrator.act(state)
 
 
-def orchestrator_router(state: MathState) -> str:
-    """Router for conditional edges out of the orchestrator node."""
-    return orchestrator.decide_next(state)
-
-
-def generator_node(state: MathState) -> MathState:
-    return generator.act(state)
-
-
-def validator_node(state: MathState) -> MathState:
-    return validator.act(state)
-
-
-def critic_node(state: MathState) -> MathState:
-    return critic.act(state)
-
-
-def refiner_node(state: MathState) -> MathState:
-    return refiner.act(state)
-
-
-def evaluator_node(state: MathState) -> MathState:
-    return evaluator.act(state)
-
-
-def build_app():
-    workflow = StateGraph(MathState)
-
-    workflow.add_node("orchestrator", orchestrator_node)
-    workflow.add_node("generator", generator_node)
-    workflow.add_node("validator", validator_node)
-    workflow.add_node("critic", critic_node)
-    workflow.add_node("refiner", refiner_node)
-    workflow.add_node("evaluator", evaluator_node)
-
-    workflow.set_entry_point("orchestrator")
-
-    workflow.add_conditional_edges(
-        "orchestrator",
-        orchestrator_router,
-        {
-            "generator": "generator",
-            "validator": "validator",
-            "critic": "critic",
-            "refiner": "refiner",
-            "evaluator": "evaluator",
-            "end": END,
-        },
-    )
-
-    # Linear pipeline between worker agents
-    workflow.add_edge("generator", "validator")
-    workflow.add_edge("validator", "critic")
-    workflow.add_edge("critic", "refiner")
-    workflow.add_edge("refiner", "evaluator")
-    workflow.add_edge("evaluator", "orchestrator")  # go back to orchestrator to finish
-
-    return workflow.compile()
-
-
-app = build_app()
-
-
 # ============================================================
 # GSM8K EVALUATION LOOP
 # ============================================================
@@ -274,86 +166,199 @@ def solve_math_problem(
     Returns:
         final_state: MathState containing all intermediate artifacts.
     """
+    clear_memo()  # temperature-0 replies are reused within this example only
     initial_state: MathState = {
         "question": question,
         "solution_key": solution_key,
+        "_gold_float": to_float(solution_key),  # parsed once; the validator compares against it
         "dialogue": [],
     }
-    final_state = app.invoke(initial_state)
+    final_state = run_pipeline(initial_state)
     return final_state
 
 
+async def _solve_pool_async(questions: List[str], concurrency: int, on_done, first_example: int = 1) -> None:
+    # Sliding window: a new question starts as soon as any in-flight one finishes,
+    # so one slow example no longer holds back a whole batch
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(i: int, question: str):
+        async with sem:
+            print("\n================== Example #{} ==================\n".format(first_example + i))
+            print(question)
+            state = {"question": question, "solution_key": None, "_gold_float": None, "dialogue": []}
+            return i, await arun_pipeline(state)
+
+    # The run owns one AsyncClient; it is closed with its connections when the pool finishes.
+    # Examples overlap here, so the reply memo is cleared once per run (it is size-bounded)
+    clear_memo()
+    async with async_session():
+        tasks = [asyncio.create_task(one(i, q)) for i, q in enumerate(questions)]
+        # Finished states are handed to on_done in input order (buffering any that
+        # complete early), so the results file always holds a clean prefix
+        done: Dict[int, MathState] = {}
+        next_i = 0
+        for fut in asyncio.as_completed(tasks):
+            i, state = await fut
+            done[i] = state
+            while next_i in done:
+                # A truthy return from on_done stops the run: drop everything still queued/in flight
+                if on_done(next_i, done.pop(next_i)):
+                    for t in tasks:
+                        t.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    return
+                next_i += 1
+
+
+def solve_math_problems_pool(questions: List[str], concurrency: int, on_done, first_example: int = 1) -> None:
+    """Run the async pipeline over `questions` with at most `concurrency` in flight.
+
+    `on_done(index, final_state)` is called in input order as results become available;
+    returning True from it cancels the remaining questions.
+    """
+    asyncio.run(_solve_pool_async(questions, concurrency, on_done, first_example))
+
+
+def solve_math_problems_batch(questions: List[str], concurrency: Optional[int] = None) -> List[MathState]:
+    """Run the async pipeline on several questions concurrently (results in input order)."""
+    results: List[Optional[MathState]] = [None] * len(questions)
+    solve_math_problems_pool(questions, concurrency or len(questions), results.__setitem__)
+    return results
+
+
 import argparse
 import json
+import re
 import csv
+import itertools
+from datetime import datetime, timezone
 from tqdm import tqdm
 
 
-def normalize_number(s: str):
-    if s is None:
-        return None
-    s = str(s).strip()
-    s = s.replace(",", "")
-    s = s.replace("$", "")
-    s = s.rstrip(".\n ")
-    try:
-        if "." in s:
-            return float(s)
-        return int(s)
-    except Exception:
-        last = extract_last_number(s)
-        if last is None:
-            return None
-        try:
-            if "." in last:
-                return float(last)
-            return int(last)
-        except Exception:
-            return None
+_CORRECT_RE = re.compile(rb'"correct":\s*true')
+_PRED_KEYS = ("final_answer", "refined_answer", "initial_answer")
+_EARLY_STOP_MIN = 50  # examples scored before --early-stop-accuracy may end a run
 
 
-def numeric_eq(a, b):
-    if a is None or b is None:
-        return False
+def _load_progress(progress_path: str, results_path: str) -> Tuple[int, int]:
+    """Return (processed, correct) for a run, reconciling progress.json with the JSONL.
+
+    progress.json records the counts together with the JSONL size they cover, so
+    only rows appended after that point (a crash between writing a row and saving
+    progress) are scanned and counted. Runs without a usable progress.json are
+    scanned in full. A torn last line is cut off so appended rows start cleanly.
+    """
+    processed = correct = offset = 0
     try:
-        af = float(a)
-        bf = float(b)
-        return abs(af - bf) < 1e-6
+        with open(progress_path, "r", encoding="utf-8") as pf:
+            p = json.load(pf)
+        processed, correct, offset = int(p["processed"]), int(p["correct"]), int(p["offset"])
+        if offset > os.path.getsize(results_path):
+            raise ValueError("progress.json is ahead of the results file")
     except Exception:
-        return str(a).strip() == str(b).strip()
+        processed = correct = offset = 0
+    # Count rows and grep the flag instead of parsing each one
+    end = offset
+    with open(results_path, "r+b") as rf:
+        rf.seek(offset)
+        for line in rf:
+            if not line.endswith(b"\n"):
+                break  # partially written row
+            end += len(line)
+            if not line.strip():
+                continue
+            processed += 1
+            if _CORRECT_RE.search(line):
+                correct += 1
+        rf.truncate(end)
+    return processed, correct
 
 
-def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = False, resume_run_dir: Optional[str] = None):
-    try:
+def _save_progress(path: str, processed: int, correct: int, offset: int) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as pf:
+        json.dump({"processed": processed, "correct": correct, "offset": offset}, pf)
+    os.replace(tmp, path)
+
+
+def _read_rows(results_path: str, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    with open(results_path, "rb") as rf:
+        for line in rf:
+            if len(rows) >= limit:
+                break
+            try:
+                rows.append(json_loads(line))
+            except Exception:
+                # ignore malformed lines
+                continue
+    return rows
+
+
+_LOAD_DATASET = None
+_STREAM_MAX = 200  # --max-examples below this streams rows instead of loading the split
+
+
+def _get_load_dataset():
+    """Import `datasets.load_dataset` on first use (the import itself is slow)."""
+    global _LOAD_DATASET
+    if _LOAD_DATASET is None:
         from datasets import load_dataset
-    except Exception as e:
-        print("Please install the `datasets` package (pip install datasets) to run GSM8K evaluation.")
-        raise
+        _LOAD_DATASET = load_dataset
+    return _LOAD_DATASET
 
-    # Load dataset
-    dataset = None
+
+def _stream_gsm8k(load_dataset, split: str, max_examples: int) -> Optional[List[Dict[str, Any]]]:
     for config in ["main", None]:
         try:
-            ds = load_dataset("gsm8k", config, split=split)
-            dataset = ds
-            break
+            rows = list(itertools.islice(load_dataset("gsm8k", config, split=split, streaming=True), max_examples))
         except Exception:
             continue
+        print(f"Streamed {len(rows)} GSM8K examples from split={split}")
+        return rows
+    return None
+
+
+def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = False, resume_run_dir: Optional[str] = None, concurrency: int = 1, early_stop_accuracy: Optional[float] = None):
+    try:
+        load_dataset = _get_load_dataset()
+    except Exception as e:
+        print("Please install the `datasets` package (pip install datasets) to run GSM8K evaluation.")
+        raise
+
+    dataset = None
+    # Small runs stream just the first rows instead of materializing the whole split
+    # (falls back to the regular load below, e.g. when offline with a cached copy)
+    if max_examples is not None and max_examples < _STREAM_MAX:
+        dataset = _stream_gsm8k(load_dataset, split, max_examples)
+
     if dataset is None:
-        try:
-            dataset = load_dataset("gsm8k", split=split)
-        except Exception as e:
-            print("Failed to load GSM8K via `datasets`. Error:", e)
-            return
+        # Load dataset
+        for config in ["main", None]:
+            try:
+                ds = load_dataset("gsm8k", config, split=split)
+                dataset = ds
+                break
+            except Exception:
+                continue
+        if dataset is None:
+            try:
+                dataset = load_dataset("gsm8k", split=split)
+            except Exception as e:
+                print("Failed to load GSM8K via `datasets`. Error:", e)
+                return
 
-    n = len(dataset)
-    print(f"Loaded GSM8K split={split} with {n} examples")
-    if max_examples is not None:
-        dataset = dataset.select(range(min(max_examples, n)))
+        n = len(dataset)
+        print(f"Loaded GSM8K split={split} with {n} examples")
+        if max_examples is not None:
+            dataset = dataset.select(range(min(max_examples, n)))
 
     os.makedirs("output", exist_ok=True)
     # Determine run directory: either resume an existing run or create a new timestamped run dir
-    from datetime import datetime
+    # One clock read per run; the colon-free stamp names both the run dir and the JSON summary
+    # (ISO timestamps with ':' are not valid directory names on Windows)
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
     if resume_run_dir:
         if not os.path.isdir(resume_run_dir):
@@ -365,45 +370,47 @@ def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = Fals
         if not os.path.isdir("output"):
             print("No output directory found to resume from.")
             return
-        cand = [os.path.join("output", d) for d in os.listdir("output") if os.path.isdir(os.path.join("output", d))]
+        # scandir yields is_dir()/stat() from the directory listing itself
+        with os.scandir("output") as it:
+            cand = [(e.path, e.stat().st_mtime) for e in it if e.is_dir()]
         if not cand:
             print("No previous runs found in output/ to resume.")
             return
         # choose the most recently modified directory
-        run_dir = max(cand, key=os.path.getmtime)
+        run_dir = max(cand, key=lambda c: c[1])[0]
         print(f"Resuming from latest run dir: {run_dir}")
     else:
-        ts_iso = datetime.utcnow().isoformat()  # e.g. 2025-11-18T12:34:56.789012
-        run_dir = os.path.join("output", ts_iso)
-        os.makedirs(run_dir, exist_ok=True)
+        run_dir = os.path.join("output", ts)  # e.g. 20251118T123456Z
+        # A fresh dir per run: two runs started in the same second get -1, -2, ...
+        # instead of sharing one dir (and truncating each other's results file)
+        n = 0
+        while True:
+            try:
+                os.makedirs(run_dir)
+                break
+            except FileExistsError:
+                n += 1
+                run_dir = os.path.join("output", f"{ts}-{n}")
 
     results_path = os.path.join(run_dir, "gsm8k_results.jsonl")
     summary_path = os.path.join(run_dir, "gsm8k_summary.csv")
+    progress_path = os.path.join(run_dir, "progress.json")
 
     # If resuming and results file exists, count already-processed examples and load cumulative correctness
     already_processed = 0
     correct = 0
     failures = []
+    # Every row written this run is kept here; resumed rows are only read back
+    # once, for the JSON summary at the end
+    entries: List[Dict[str, Any]] = []
     if (resume or resume_run_dir) and os.path.exists(results_path):
         try:
-            with open(results_path, "r", encoding="utf-8") as rf:
-                for line in rf:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        j = json.loads(line)
-                        already_processed += 1
-                        if j.get("correct"):
-                            correct += 1
-                    except Exception:
-                        # ignore malformed lines
-                        continue
+            already_processed, correct = _load_progress(progress_path, results_path)
         except Exception as e:
             print(f"Failed to read existing results for resume: {e}")
 
     # Open results file for append if resuming, else write new
-    results_f = open(results_path, "a" if ((resume or resume_run_dir) and already_processed > 0) else "w", encoding="utf-8")
+    results_f = open(results_path, "ab" if ((resume or resume_run_dir) and already_processed > 0) else "wb")
 
     total = already_processed
 
@@ -413,39 +420,30 @@ def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = Fals
         results_f.close()
         return
 
-    for idx, ex in enumerate(tqdm(dataset, desc="GSM8K")):
-        # skip already-processed examples when resuming
-        if idx < already_processed:
-            continue
+    # Keep up to `concurrency` examples in flight on the async pipeline; rows are
+    # still written in dataset order, so --resume sees a clean prefix
+    examples = [dataset[i] for i in range(already_processed, len(dataset))]
+    questions = [ex.get("question") or ex.get("Problem") or ex.get("question_text") for ex in examples]
+    golds = [ex.get("answer") or ex.get("correct_answer") or ex.get("solution") or "" for ex in examples]
+    print(f"Loading model {os.getenv('OLLAMA_QWEN_MODEL', 'qwen2:32b')} ...")
+    warm_model()
+    progress = tqdm(total=len(dataset), initial=already_processed, desc="GSM8K")
+
+    def record(i: int, final_state: MathState) -> bool:
+        nonlocal total, correct
+        question, gold_raw = questions[i], golds[i]
         total += 1
-        question = ex.get("question") or ex.get("Problem") or ex.get("question_text")
-        gold_raw = ex.get("answer") or ex.get("correct_answer") or ex.get("solution") or ""
         gold_norm = normalize_number(gold_raw)
 
-        print("\n================== Example #{} ==================\n".format(total))
-        print(question)
-
-        # Run pipeline
-        final_state = solve_math_problem(question, solution_key=None)
-
         # Try to extract predicted answer from the compiled state
-        pred_candidates = []
-        if final_state.get("final_answer"):
-            pred_candidates.append(final_state.get("final_answer"))
-        if final_state.get("refined_answer"):
-            pred_candidates.append(final_state.get("refined_answer"))
-        if final_state.get("initial_answer"):
-            pred_candidates.append(final_state.get("initial_answer"))
-
         pred = None
-        for c in pred_candidates:
-            if not c:
-                continue
-            c_plain = strip_ansi(c)
-            n = normalize_number(c_plain)
-            if n is not None:
-                pred = n
-                break
+        for key in _PRED_KEYS:
+            c = final_state.get(key)
+            if c:
+                n = normalize_number(c)
+                if n is not None:
+                    pred = n
+                    break
 
         correct_flag = numeric_eq(pred, gold_norm)
         if correct_flag:
@@ -455,11 +453,25 @@ def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = Fals
                 "question": question,
                 "gold": gold_raw,
                 "pred": pred,
-                "state": {k: strip_ansi(str(v))[:1000] for k, v in final_state.items() if k in ("final_answer","refined_answer","initial_answer")}
+                "state": {k: str(v)[:1000] for k, v in final_state.items() if k in _PRED_KEYS}
             })
 
         out = {"question": question, "gold": gold_raw, "gold_norm": gold_norm, "pred": pred, "correct": correct_flag}
-        results_f.write(json.dumps(out, ensure_ascii=False) + "\n")
+        entries.append(out)
+        results_f.write(json_dumps(out) + b"\n")
+        results_f.flush()
+        _save_progress(progress_path, total, correct, results_f.tell())
+        progress.update(1)
+        progress.set_postfix(acc=f"{correct / total:.3f}")
+
+        # Debug/sweep runs: stop once accuracy is clearly above the target
+        if early_stop_accuracy is not None and total >= _EARLY_STOP_MIN and correct / total > early_stop_accuracy:
+            print(f"\nEarly stop: accuracy {correct / total:.4f} > {early_stop_accuracy} after {total} examples")
+            return True
+        return False
+
+    solve_math_problems_pool(questions, concurrency, record, first_example=already_processed + 1)
+    progress.close()
 
     results_f.close()
 
@@ -481,22 +493,10 @@ def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = Fals
 
     # Also write a JSON summary into the run directory with per-example results and accuracy
     try:
-        from datetime import datetime
-        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         model_name = os.getenv("OLLAMA_QWEN_MODEL", "<unknown>")
         out_path = os.path.join(run_dir, f"gsm8k_summary_{ts}.json")
-        # collect entries from results_path
-        entries = []
-        try:
-            with open(results_path, "r", encoding="utf-8") as rf:
-                for line in rf:
-                    try:
-                        entries.append(json.loads(line))
-                    except Exception:
-                        pass
-        except Exception:
-            entries = []
-
+        if already_processed:
+            entries = _read_rows(results_path, already_processed) + entries
         summary_obj = {
             "timestamp": ts,
             "model": model_name,
@@ -507,8 +507,8 @@ def run_gsm8k(split: str = "test", max_examples: int = None, resume: bool = Fals
             "entries": entries,
             "run_dir": run_dir,
         }
-        with open(out_path, "w", encoding="utf-8") as of:
-            json.dump(summary_obj, of, ensure_ascii=False, indent=2)
+        with open(out_path, "wb") as of:
+            of.write(json_dumps(summary_obj, indent=True))
         print(f"Run directory: {run_dir}")
         print(f"Summary JSON written to: {out_path}")
     except Exception as e:
@@ -521,5 +521,7 @@ if __name__ == "__main__":
     parser.add_argument("--max-examples", type=int, default=2, help="Limit number of examples for quick runs")
     parser.add_argument("--resume", action="store_true", help="Resume from the latest run in output/")
     parser.add_argument("--run-dir", default=None, help="Path to a specific run directory to resume (overrides --resume)")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("GSM8K_CONCURRENCY", os.getenv("OLLAMA_NUM_PARALLEL", "4"))), help="Examples in flight through the pipeline at once (env: GSM8K_CONCURRENCY; match the server's OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--early-stop-accuracy", type=float, default=None, help="Stop once accuracy exceeds this fraction (checked after 50 examples); for quick sweeps")
     args = parser.parse_args()
-    run_gsm8k(split=args.split, max_examples=args.max_examples, resume=args.resume, resume_run_dir=args.run_dir)
+    run_gsm8k(split=args.split, max_examples=args.max_examples, resume=args.resume, resume_run_dir=args.run_dir, concurrency=args.concurrency, early_stop_accuracy=args.early_stop_accuracy)
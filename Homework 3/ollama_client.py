@@ -0,0 +1,214 @@
+"""
+Ollama model functions shared by `main.py` and `main_gsm8k.py`.
+
+- `qwen_32b_model(prompt, temperature, system)`: blocking call over a pooled
+  `httpx.Client` (or the `ollama` python client when requested).
+- `qwen_32b_model_async(...)`: async twin used by the concurrent runners; it
+  runs inside an `async_session()` that owns the AsyncClient for that run.
+- `warm_model()`: load the model on the server before a timed loop.
+- `clear_memo()`: drop the in-process memo of temperature-0 replies; the
+  runners call it when a new example starts.
+
+Env vars: `OLLAMA_HOST`, `OLLAMA_QWEN_MODEL`, `OLLAMA_KEEP_ALIVE`,
+`OLLAMA_NUM_PARALLEL`, `USE_OLLAMA_PYTHON_CLIENT` (read at import, so runners
+that take CLI overrides import this module after applying them).
+"""
+from __future__ import annotations
+
+from typing import Optional, Dict, Any
+import os
+import asyncio
+import atexit
+import contextlib
+import importlib.util
+import httpx
+from dotenv import load_dotenv
+
+from utils import ollama_keep_alive
+
+load_dotenv()
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+if not OLLAMA_HOST.startswith(("http://", "https://")):
+    OLLAMA_HOST = "http://" + OLLAMA_HOST
+
+# One pooled client per process, shared by every agent. HTTP/2 is enabled when the
+# `h2` package is installed (httpx[http2]); a plain-http local server still gets
+# HTTP/1.1 keep-alive connections from the same pool.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_CLIENT = httpx.Client(base_url=OLLAMA_HOST, http2=_HTTP2, limits=_LIMITS, timeout=300)
+atexit.register(_CLIENT.close)
+
+# How long the server keeps the model loaded after a request (see utils.ollama_keep_alive)
+OLLAMA_KEEP_ALIVE = ollama_keep_alive()
+
+
+def _bind_ollama_chat():
+    """Resolve the python client's chat call once at import.
+
+    Returns `ollama.Client(...).chat` when `USE_OLLAMA_PYTHON_CLIENT` is set and
+    the package imports, else None (HTTP is used instead).
+    """
+    if os.getenv("USE_OLLAMA_PYTHON_CLIENT", "false").lower() not in ("1", "true", "yes"):
+        return None
+    try:
+        import ollama
+        return ollama.Client(host=OLLAMA_HOST).chat
+    except Exception:
+        return None
+
+
+_OLLAMA_CHAT = _bind_ollama_chat()
+
+
+# Qwen 32B model integration via the local Ollama server
+def _chat_request(prompt: str, temperature: float, system: Optional[str]) -> Dict[str, Any]:
+    """Body for /api/chat. The system prompt goes first as its own message so the
+    server can reuse the KV cache for that unchanged prefix across calls, and
+    keep_alive holds the model in memory between agent turns."""
+    messages = [{"role": "user", "content": prompt}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
+    return {
+        "model": os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b"),
+        "messages": messages,
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {"temperature": float(temperature)},
+    }
+
+
+# Temperature-0 decoding is deterministic, so within one example a repeated
+# (model, system, prompt) gets the reply we already have instead of another
+# round trip. Always on and in-process only (agents/cache.py is the opt-in
+# persistent layer); error strings are never memoized, so a failed call retries.
+_MEMO: Dict[tuple, str] = {}
+_MEMO_MAX = 1024
+
+
+def clear_memo() -> None:
+    """Forget memoized temperature-0 replies (called at the start of each example/run)."""
+    _MEMO.clear()
+
+
+def _memo_key(prompt: str, temperature: float, system: Optional[str]) -> Optional[tuple]:
+    if float(temperature) != 0.0:
+        return None
+    return (os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b"), system, prompt)
+
+
+def _memo_put(key: Optional[tuple], reply: str) -> str:
+    if key is not None and not reply.startswith("[ollama-"):
+        if len(_MEMO) >= _MEMO_MAX:
+            _MEMO.clear()
+        _MEMO[key] = reply
+    return reply
+
+
+def qwen_32b_model(prompt: str, temperature: float = 0.0, system: Optional[str] = None) -> str:
+    """Memoized front of `_qwen_32b_chat`: temperature-0 replies are reused until `clear_memo()`."""
+    key = _memo_key(prompt, temperature, system)
+    if key is not None and key in _MEMO:
+        return _MEMO[key]
+    return _memo_put(key, _qwen_32b_chat(prompt, temperature, system))
+
+
+def _qwen_32b_chat(prompt: str, temperature: float = 0.0, system: Optional[str] = None) -> str:
+    """Run a local Qwen model through the Ollama chat API.
+
+    Behavior:
+    - Reads env var `OLLAMA_QWEN_MODEL` for the model name (default: `qwen2:32b`).
+    - Sends `system` (if given) and `prompt` as separate chat messages.
+    - Uses `ollama.Client.chat` when `USE_OLLAMA_PYTHON_CLIENT` was set at import
+      and the client is installed; otherwise POSTs to `$OLLAMA_HOST/api/chat`.
+    - Returns the generated text on success, or a helpful error string on failure.
+
+    This keeps the integration optional: if Ollama or the model isn't available,
+    the function returns an informative placeholder string instead of raising.
+    """
+    payload = _chat_request(prompt, temperature, system)
+
+    # 1) Python client if requested and available
+    if _OLLAMA_CHAT is not None:
+        try:
+            resp = _OLLAMA_CHAT(**payload)
+            return str(resp["message"]["content"]).strip()
+        except Exception as e:
+            return f"[ollama-py-error] {e}"
+
+    # 2) Plain HTTP against the running server
+    try:
+        resp = _CLIENT.post("/api/chat", json=payload)
+        if resp.status_code != 200:
+            return f"[ollama-error] {resp.text.strip()}"
+        return resp.json().get("message", {}).get("content", "").strip()
+    except httpx.ConnectError:
+        return f"[ollama-missing] no ollama server at {OLLAMA_HOST}"
+    except httpx.TimeoutException:
+        return "[ollama-error] ollama chat timed out"
+    except Exception as e:
+        return f"[ollama-error] {e}"
+
+
+def warm_model() -> None:
+    """Load the model on the server ahead of the first agent call.
+
+    A generate request without a prompt only loads the weights, so the cold
+    load happens here instead of inside the first example.
+    """
+    payload = {"model": os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b"), "keep_alive": OLLAMA_KEEP_ALIVE}
+    try:
+        _CLIENT.post("/api/generate", json=payload)
+    except Exception:
+        # The first real call reports a missing server/model properly
+        pass
+
+
+# Async twin used by the batch runners. Each run opens one AsyncClient (same pool
+# limits as _CLIENT) in `async_session()`, and it is closed with its connections
+# when the run ends. The semaphore is sized to the server's OLLAMA_NUM_PARALLEL
+# so we never queue more requests than Ollama will actually run at once.
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+_ASYNC = None  # (AsyncClient, Semaphore) of the session in progress
+
+
+@contextlib.asynccontextmanager
+async def async_session():
+    """Own the AsyncClient for one async run: `async with async_session(): ...`."""
+    global _ASYNC
+    prev = _ASYNC
+    async with httpx.AsyncClient(base_url=OLLAMA_HOST, http2=_HTTP2, limits=_LIMITS, timeout=300) as client:
+        _ASYNC = (client, asyncio.Semaphore(OLLAMA_NUM_PARALLEL))
+        try:
+            yield
+        finally:
+            _ASYNC = prev
+
+
+async def qwen_32b_model_async(prompt: str, temperature: float = 0.0, system: Optional[str] = None) -> str:
+    """Async version of `qwen_32b_model` (same env vars, memo and error strings)."""
+    key = _memo_key(prompt, temperature, system)
+    if key is not None and key in _MEMO:
+        return _MEMO[key]
+    if _OLLAMA_CHAT is not None:
+        return _memo_put(key, await asyncio.to_thread(_qwen_32b_chat, prompt, temperature, system))
+    if _ASYNC is None:
+        # Called outside a runner: give this one call its own short-lived session
+        async with async_session():
+            return await qwen_32b_model_async(prompt, temperature, system)
+
+    payload = _chat_request(prompt, temperature, system)
+    client, sem = _ASYNC
+    try:
+        async with sem:
+            resp = await client.post("/api/chat", json=payload)
+        if resp.status_code != 200:
+            return f"[ollama-error] {resp.text.strip()}"
+        return _memo_put(key, resp.json().get("message", {}).get("content", "").strip())
+    except httpx.ConnectError:
+        return f"[ollama-missing] no ollama server at {OLLAMA_HOST}"
+    except httpx.TimeoutException:
+        return "[ollama-error] ollama chat timed out"
+    except Exception as e:
+        return f"[ollama-error] {e}"
@@ -17,8 +17,11 @@ import subprocess
 import os
 import sys
 import time
-import json
-from datetime import datetime
+import collections
+from datetime import datetime, timezone
+
+from utils import json_dumps, json_loads
+
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--model", default=os.getenv("OLLAMA_QWEN_MODEL", "qwen2:32b"), help="Model name")
@@ -51,40 +54,45 @@ cmd = [sys.executable, script, "--model", args.model, "--max-examples", str(args
 if args.use_ollama_py:
     cmd.append("--use-ollama-py")
 
+
+def run_streaming(cmd, tail_lines: int = 40):
+    """Run `cmd`, echoing its combined stdout/stderr live; return (exit code, last `tail_lines` lines)."""
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    # Only a bounded tail is kept, so a full 1319-example run doesn't sit in memory
+    tail = collections.deque(maxlen=tail_lines)
+    for line in proc.stdout:
+        print(line, end="")
+        tail.append(line)
+    proc.stdout.close()
+    return proc.wait(), "".join(tail)
+
+
 print("Running:", " ".join(cmd))
 start = time.time()
-proc = subprocess.run(cmd, capture_output=True, text=True)
+returncode, tail = run_streaming(cmd)
 end = time.time()
-print(f"Process exit code: {proc.returncode}")
-if proc.stdout:
-    print("--- STDOUT ---")
-    print(proc.stdout[:4000])
-if proc.stderr:
-    print("--- STDERR ---")
-    print(proc.stderr[:4000])
+print(f"Process exit code: {returncode}")
 
 # If agent run failed, fall back to baseline
-if proc.returncode != 0 and script == "main_gsm8k.py":
+if returncode != 0 and script == "main_gsm8k.py":
     print("Agent pipeline failed; falling back to baseline runner.")
+    print("--- last output ---")
+    print(tail)
     script = "main_baseline.py"
     result_jsonl = os.path.join("output", "gsm8k_baseline_results.jsonl")
     cmd = [sys.executable, script, "--model", args.model, "--max-examples", str(args.max_examples), "--split", args.split]
     if args.use_ollama_py:
         cmd.append("--use-ollama-py")
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    print(f"Fallback process exit code: {proc.returncode}")
-    if proc.stdout:
-        print(proc.stdout[:4000])
-    if proc.stderr:
-        print(proc.stderr[:4000])
+    returncode, tail = run_streaming(cmd)
+    print(f"Fallback process exit code: {returncode}")
 
 # Read results JSONL
 entries = []
 if os.path.exists(result_jsonl):
-    with open(result_jsonl, "r", encoding="utf-8") as f:
+    with open(result_jsonl, "rb") as f:
         for line in f:
             try:
-                entries.append(json.loads(line))
+                entries.append(json_loads(line))
             except Exception:
                 pass
 else:
@@ -96,7 +104,7 @@ correct = sum(1 for e in entries if e.get("correct") is True)
 accuracy = float(correct) / float(total) if total else None
 
 # timestamped output
-ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 out_path = os.path.join("output", f"gsm8k_{ts}.json")
 summary = {
     "timestamp": ts,
@@ -108,8 +116,8 @@ summary = {
     "runtime_seconds": end - start,
     "examples": entries,
 }
-with open(out_path, "w", encoding="utf-8") as of:
-    json.dump(summary, of, ensure_ascii=False, indent=2)
+with open(out_path, "wb") as of:
+    of.write(json_dumps(summary, indent=True))
 
 print(f"Wrote timestamped summary: {out_path}")
 print(f"Accuracy: {accuracy}")
@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from agents.generator_agent import GeneratorAgent
+from agents.orchestrator_agent import OrchestratorAgent, Stage
+from agents.validator_agent import ValidatorAgent
+
+
+def _stub_model(*replies):
+    """Sync model returning `replies` in order and recording each prompt."""
+    calls = []
+    outs = iter(replies)
+
+    def model(prompt, temperature=0.0, system=None):
+        calls.append(prompt)
+        return next(outs)
+
+    return model, calls
+
+
+def _no_model(prompt, temperature=0.0, system=None):
+    raise AssertionError("model should not be called")
+
+
+class StageRoutingTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.orchestrator = OrchestratorAgent("Orchestrator", model=_no_model)
+
+    def test_decide_next_follows_stage(self):
+        self.assertEqual(self.orchestrator.decide_next({}), "generator")
+        expected = ["generator", "validator", "critic", "refiner", "evaluator", "end"]
+        for stage, name in zip(Stage, expected):
+            self.assertEqual(self.orchestrator.decide_next({"_stage": stage}), name)
+
+    def test_end_sets_final_answer(self):
+        state = {"_stage": Stage.END, "initial_answer": "a", "refined_answer": "b", "dialogue": []}
+        self.assertEqual(self.orchestrator.act(state)["final_answer"], "b")
+        state = {"_stage": Stage.END, "initial_answer": "a", "dialogue": []}
+        self.assertEqual(self.orchestrator.act(state)["final_answer"], "a")
+
+
+class ValidatorFastPathTest(unittest.TestCase):
+    def setUp(self):
+        for patcher in (mock.patch("builtins.print"), mock.patch("agents.validator_agent.HAS_SYMPY", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_symbolic_match_skips_model_and_critic(self):
+        state = {"initial_answer": "So 6 * 7 = 42\nFinal Answer: 42", "solution_key": "42", "dialogue": []}
+        state = ValidatorAgent(model=_no_model).act(state)
+        self.assertEqual(state["_stage"], Stage.EVALUATOR)
+        self.assertEqual(state["refined_answer"], state["initial_answer"])
+        self.assertTrue(state["validator_report"]["symbolic_check"])
+
+    def test_mismatch_goes_to_critic(self):
+        model, calls = _stub_model("errors: []")
+        state = {"initial_answer": "Final Answer: 41", "solution_key": "42", "dialogue": []}
+        state = ValidatorAgent(model=model).act(state)
+        self.assertEqual(state["_stage"], Stage.CRITIC)
+        self.assertEqual(len(calls), 1)
+
+
+class GeneratorSinglePassTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_agreeing_final_answer_skips_second_pass(self):
+        model, calls = _stub_model("2 + 3 = 5\nFinal Answer: 5")
+        state = GeneratorAgent(model=model).act({"question": "2 + 3?", "dialogue": []})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(state["_stage"], Stage.VALIDATOR)
+        self.assertEqual(state["tool_result"], "5")
+        self.assertEqual(state["initial_answer"], "2 + 3 = 5\nFinal Answer: 5")
+
+    def test_disagreeing_tool_result_runs_second_pass(self):
+        model, calls = _stub_model("Final Answer: 2*3", "Final Answer: 6")
+        state = GeneratorAgent(model=model).act({"question": "2 * 3?", "dialogue": []})
+        self.assertEqual(len(calls), 2)
+        self.assertIn("6", calls[1])
+        self.assertEqual(state["initial_answer"], "Final Answer: 6")
+        self.assertEqual(state["_stage"], Stage.VALIDATOR)
+
+
+if __name__ == "__main__":
+    unittest.main()
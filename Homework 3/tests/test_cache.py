@@ -0,0 +1,46 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agents import cache
+from agents.base_agent import BaseAgent
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"AGENT_CACHE_PATH": os.path.join(tmp, "cache.sqlite3")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache._CONN = None
+        self.addCleanup(setattr, cache, "_CONN", None)
+
+    def test_off_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("AGENT_CACHE", None)
+            self.assertFalse(cache.enabled())
+
+    def test_key_includes_options(self):
+        self.assertNotEqual(
+            cache.make_key("m", {"temperature": 0.0}, "", "q"),
+            cache.make_key("m", {"temperature": 0.0, "num_ctx": 8192}, "", "q"),
+        )
+
+    def test_async_call_replays_cached_output(self):
+        calls = []
+
+        async def model(prompt, temperature=0.0):
+            calls.append(prompt)
+            return "42"
+
+        agent = BaseAgent("A", model=lambda p, temperature=0.0: "42", async_model=model)
+        with mock.patch.dict(os.environ, {"AGENT_CACHE": "1"}), mock.patch("builtins.print"):
+            self.assertEqual(asyncio.run(agent.acall("q")), "42")
+            self.assertEqual(asyncio.run(agent.acall("q")), "42")
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
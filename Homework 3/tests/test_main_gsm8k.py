@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from main_gsm8k import _load_progress, _save_progress
+from utils import json_dumps
+
+
+class LoadProgressTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.results_path = os.path.join(tmp, "gsm8k_results.jsonl")
+        self.progress_path = os.path.join(tmp, "progress.json")
+        self.rows = [
+            json_dumps({"question": "q1", "pred": 1, "correct": True}) + b"\n",
+            json_dumps({"question": "q2", "pred": 2, "correct": False}) + b"\n",
+        ]
+
+    def _write(self, data: bytes):
+        with open(self.results_path, "wb") as f:
+            f.write(data)
+
+    def test_torn_last_line_is_truncated(self):
+        self._write(b"".join(self.rows) + b'{"question": "q3", "co')
+        self.assertEqual(_load_progress(self.progress_path, self.results_path), (2, 1))
+        with open(self.results_path, "rb") as f:
+            self.assertEqual(f.read(), b"".join(self.rows))
+
+    def test_counts_rows_written_after_progress(self):
+        self._write(b"".join(self.rows))
+        _save_progress(self.progress_path, 1, 1, len(self.rows[0]))
+        self.assertEqual(_load_progress(self.progress_path, self.results_path), (2, 1))
+
+    def test_ignores_progress_ahead_of_results(self):
+        self._write(self.rows[0])
+        _save_progress(self.progress_path, 5, 5, 10 ** 6)
+        self.assertEqual(_load_progress(self.progress_path, self.results_path), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from agents.tools import calculate_expression
+
+
+class CalculateExpressionTest(unittest.TestCase):
+    def test_arithmetic(self):
+        self.assertEqual(calculate_expression("3*4 + 5/2"), "14.5")
+        self.assertEqual(calculate_expression("2**100"), str(2 ** 100))
+
+    def test_computed_exponents(self):
+        self.assertEqual(calculate_expression("2**(1+2)"), "8")
+        self.assertEqual(calculate_expression("(1+0.05)**(12*3)"), str((1 + 0.05) ** (12 * 3)))
+        self.assertEqual(calculate_expression("2**-(3-1)"), "0.25")
+        self.assertEqual(calculate_expression("2**(50+1)"), str(2 ** 51))
+        self.assertTrue(calculate_expression("2**(100+1)").startswith("[tool-error]"))
+
+    def test_rejects_unsafe_nodes(self):
+        self.assertTrue(calculate_expression("__import__('os')").startswith("[tool-error]"))
+
+    def test_rejects_nested_powers(self):
+        for expr in ("((9**100)**100)**100", "2**10**10", "(99**99)**99"):
+            self.assertTrue(calculate_expression(expr).startswith("[tool-error]"), expr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+from unittest import mock
+
+import utils
+from utils import json_dumps, json_loads, normalize_number, to_float
+
+
+class _Int64OnlyOrjson:
+    """Stand-in for orjson's 64-bit integer limit when orjson itself isn't installed."""
+    OPT_INDENT_2 = 1
+    OPT_NON_STR_KEYS = 2
+
+    @staticmethod
+    def dumps(obj, option=0):
+        if any(isinstance(v, int) and abs(v) >= 2 ** 63 for v in obj.values()):
+            raise TypeError("Integer exceeds 64-bit range")
+        return json.dumps(obj).encode("utf-8")
+
+
+class JsonDumpsTest(unittest.TestCase):
+    def test_huge_int_round_trips(self):
+        row = {"pred": 10 ** 20, "gold": "72", "correct": False}
+        self.assertEqual(json_loads(json_dumps(row)), row)
+
+    def test_huge_int_falls_back_from_orjson(self):
+        row = {"pred": 10 ** 20, "correct": False}
+        with mock.patch.object(utils, "orjson", _Int64OnlyOrjson):
+            self.assertEqual(json.loads(utils.json_dumps(row)), row)
+            self.assertEqual(json.loads(utils.json_dumps(row, indent=True)), row)
+
+
+class NormalizeNumberTest(unittest.TestCase):
+    def test_bare_numbers(self):
+        self.assertEqual(normalize_number("72"), 72)
+        self.assertEqual(normalize_number("$1,234."), 1234)
+        self.assertEqual(normalize_number("+3"), 3)
+
+    def test_leading_dot_and_sign(self):
+        self.assertEqual(normalize_number("-.5"), -0.5)
+        self.assertEqual(normalize_number(".25"), 0.25)
+
+    def test_exponent(self):
+        self.assertEqual(normalize_number("1e5"), 100000.0)
+        self.assertEqual(normalize_number("2.5E-3"), 0.0025)
+
+    def test_falls_back_to_last_number(self):
+        self.assertEqual(normalize_number("The answer is #### 72"), 72)
+        self.assertEqual(normalize_number("answer: -.25"), -0.25)
+        self.assertIsNone(normalize_number("no digits here"))
+        self.assertIsNone(normalize_number(None))
+
+    def test_rejects_non_finite(self):
+        self.assertIsNone(normalize_number("1e400"))
+        self.assertIsNone(normalize_number("-1e400"))
+        self.assertIsNone(to_float("1e400"))
+        self.assertIsNone(to_float("nan"))
+        self.assertEqual(to_float("1,234.5"), 1234.5)
+
+
+class OllamaKeepAliveTest(unittest.TestCase):
+    def test_parses_env(self):
+        cases = {"-1": -1, "300": 300, "30m": "30m", " -1m ": "-1m"}
+        for raw, expected in cases.items():
+            with mock.patch.dict("os.environ", {"OLLAMA_KEEP_ALIVE": raw}):
+                self.assertEqual(utils.ollama_keep_alive(), expected)
+
+    def test_default(self):
+        with mock.patch.dict("os.environ", clear=True):
+            self.assertEqual(utils.ollama_keep_alive(), "30m")
+
+
+if __name__ == "__main__":
+    unittest.main()
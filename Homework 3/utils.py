@@ -1,3 +1,6 @@
+import json
+import math
+import os
 import re
 from typing import Optional
 
@@ -7,18 +10,72 @@ try:
 except Exception:
     HAS_SYMPY = False
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+# Optional sign, then 12 / 1.5 / .5, then an optional exponent (1e5, 2.5E-3)
+_NUM_RE = re.compile(r"[-+]?(?:\d+(?:\.\d+)?|\.\d+)(?:[eE][-+]?\d+)?")
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+_STRIP_TAB = str.maketrans("", "", ",$")
+
 
 def extract_last_number(text: str) -> Optional[str]:
-    matches = re.findall(r"-?\d+(?:\.\d+)?", text)
-    if not matches:
+    # Keep only the last match object instead of building a list of every number
+    last = None
+    for last in _NUM_RE.finditer(text):
+        pass
+    return last.group(0) if last is not None else None
+
+
+def normalize_number(s: str):
+    if s is None:
+        return None
+    s = str(s).strip().translate(_STRIP_TAB).rstrip(".\n ")
+    # Already a bare number -> parse it directly, otherwise take the last number in the text
+    token = s if _NUM_RE.fullmatch(s) else extract_last_number(s)
+    if token is None:
         return None
-    return matches[-1]
+    try:
+        if token.lstrip("+-").isdigit():
+            return int(token)
+        value = float(token)
+    except (ValueError, TypeError):
+        return None
+    # "1e400" overflows to inf, which json would write as invalid `Infinity`
+    return value if math.isfinite(value) else None
+
+
+def to_float(s) -> Optional[float]:
+    """float(s) with commas/whitespace stripped, or None if it doesn't parse to a finite number."""
+    if s is None:
+        return None
+    try:
+        value = float(str(s).replace(",", "").strip())
+    except ValueError:
+        return None
+    # inf/nan (e.g. "1e400", "nan") are not answers
+    return value if math.isfinite(value) else None
+
+
+def numeric_eq(a, b):
+    if a is None or b is None:
+        return False
+    try:
+        af = float(a)
+        bf = float(b)
+        return abs(af - bf) < 1e-6
+    except Exception:
+        return str(a).strip() == str(b).strip()
 
 
 def log_turn(state, speaker: str, content: str) -> None:
+    # Turns are stored as (speaker, content) tuples
     if "dialogue" not in state or state["dialogue"] is None:
         state["dialogue"] = []
-    state["dialogue"].append({"speaker": speaker, "content": content})
+    state["dialogue"].append((speaker, content))
 
 
 # ANSI color helpers for terminal visualization
@@ -28,21 +85,39 @@ BLUE = CSI + "34m"
 GREEN = CSI + "32m"
 
 
-def color_prompt_blue(text: str) -> str:
-    """Return a blue-colored version of `text` for terminal display.
+# Terminal-only coloring (prompts/outputs sent to the LLM stay plain). Bound
+# str.format methods, so each colored print skips a Python-level call frame.
+color_prompt_blue = (BLUE + "{}" + RESET).format
+color_llm_green = (GREEN + "{}" + RESET).format
 
-    Note: This only affects terminal output (display). Prompts sent to the
-    LLM should remain plain/uncolored; this helper is intended for printing
-    the prompt for human inspection.
+
+def ollama_keep_alive(default: str = "30m"):
+    """`OLLAMA_KEEP_ALIVE` as Ollama's keep_alive field.
+
+    Duration strings ("30m") pass through; a bare number of seconds is sent as a
+    JSON number, since Ollama rejects unit-less strings (-1 keeps the model loaded
+    until the server stops).
     """
-    return f"{BLUE}{text}{RESET}"
+    value = os.getenv("OLLAMA_KEEP_ALIVE", default).strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed, else stdlib json)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if indent else 0)
+        except TypeError:
+            # orjson rejects ints outside 64 bits (e.g. a huge calculator result); json has no limit
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
 
 
-def color_llm_green(text: str) -> str:
-    """Return a green-colored version of LLM output for terminal display."""
-    return f"{GREEN}{text}{RESET}"
+json_loads = orjson.loads if orjson is not None else json.loads
 
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape sequences from text."""
-    return re.sub(r"\x1b\[[0-9;]*m", "", text)
+    return _ANSI_RE.sub("", text)